@@ -0,0 +1,49 @@
+# 결과 엑셀 생성 벤치마크: 결과 시트 작성기(backend)별 소요 시간과 최대 메모리
+# 실행: python benchmarks/bench_export.py [인원 수 ...]
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.assignment import chair_label  # noqa: E402
+from lottery.export import create_result_excel  # noqa: E402
+from lottery.writers import RESULT_WRITERS  # noqa: E402
+
+SEAT_COUNT = 225
+
+
+# 앱이 만드는 것과 같은 형태의 합성 결과 (일반 좌석 225개, 나머지는 의자)
+def make_results(n_persons, seed=0):
+    rng = random.Random(seed)
+    names = [f"사람{i:06d}" for i in range(n_persons)]
+    seats = list(range(1, min(n_persons, SEAT_COUNT) + 1))
+    seats += [chair_label(i) for i in range(1, n_persons - len(seats) + 1)]
+    rng.shuffle(seats)
+    records = [{'이름': name, '랜덤값': 0, '당첨번호': seat} for name, seat in zip(names, seats)]
+    return {'records': sorted(records, key=lambda record: record['이름'])}
+
+
+def measure(results, backend):
+    create_result_excel(results, backend=backend)  # 템플릿 캐시 등 준비
+    start = time.perf_counter()
+    data = create_result_excel(results, backend=backend)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    create_result_excel(results, backend=backend)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(data)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [250, 2500, 25000]
+    print(f"{'인원':>7} {'작성기':<20} {'시간':>9} {'최대 메모리':>11} {'파일 크기':>9}")
+    for n in sizes:
+        results = make_results(n)
+        for backend in RESULT_WRITERS:
+            elapsed, peak, size = measure(results, backend)
+            print(f"{n:>7} {backend:<20} {elapsed * 1000:7.0f}ms {peak / 1e6:9.1f}MB {size / 1e3:7.0f}KB")
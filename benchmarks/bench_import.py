@@ -0,0 +1,96 @@
+# 앱 시작 import 시간 점검 (python -X importtime)
+# 앱 파일 최상위의 import 문(streamlit 제외)을 새 인터프리터에서 실행해 걸린 시간을 재고,
+# 예산을 넘거나 첫 제비뽑기 전에 불러오면 안 되는 무거운 모듈을 불러오면 종료 코드 1
+# 실행: python benchmarks/bench_import.py [--budget-ms 50] [--runs 5]
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# lottery_app2.py는 규칙 파일만 바꿔 lottery_app.py를 실행하므로 따로 재지 않음
+APPS = ['lottery_app.py']
+
+# Streamlit 자체의 import 비용은 앱에서 줄일 수 없으므로 제외
+EXCLUDED_MODULES = ('streamlit',)
+
+# 인터프리터가 -c 코드보다 먼저 불러오는 모듈 (설치된 .pth 파일 등, 앱과 무관)
+INTERPRETER_MODULES = ('site',)
+
+# 명단 업로드/결과 파일 생성 때 처음 불러와야 하는 모듈
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'PIL', 'xlsxwriter')
+
+DEFAULT_BUDGET_MS = 50
+
+
+# 앱 파일 최상위 import 문 (함수나 조건문 안의 import는 실행될 때 불러오므로 제외)
+def startup_imports(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or '']
+        else:
+            continue
+        if any(module.split('.')[0] in EXCLUDED_MODULES for module in modules):
+            continue
+        statements.append(ast.unparse(node))
+    return statements
+
+
+# import 문을 새 인터프리터에서 실행: (최상위 import 누적 시간 µs, 불러온 모듈 이름 목록)
+def measure(statements):
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '\n'.join(statements)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    modules = []
+    pending = []  # 하위 모듈은 상위 모듈보다 먼저 출력됨
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not cumulative_us.strip().isdigit():  # 머리글 행
+            continue
+        name = name[1:]
+        pending.append(name.strip())
+        # 들여쓰기 없는 이름이 최상위 import (누적 시간에 하위 모듈 포함)
+        if not name.startswith(' '):
+            if name not in INTERPRETER_MODULES:
+                total_us += int(cumulative_us)
+                modules.extend(pending)
+            pending = []
+    return total_us, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 시작 import 시간 점검")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for app in APPS:
+        statements = startup_imports(os.path.join(ROOT, app))
+        # 가장 빠른 실행 기준 (다른 프로세스 영향 제외)
+        runs = [measure(statements) for _ in range(args.runs)]
+        total_us, modules = min(runs)
+        heavy = sorted({m.split('.')[0] for m in modules} & set(HEAVY_MODULES))
+
+        ok = total_us / 1000 <= args.budget_ms and not heavy
+        failed = failed or not ok
+        print(f"{app:<18} {total_us / 1000:7.1f}ms / 예산 {args.budget_ms:.0f}ms "
+              f"(모듈 {len(modules)}개) {'통과' if ok else '실패'}")
+        if heavy:
+            print(f"  시작 시 불러오면 안 되는 모듈: {', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# 좌석 배정 벤치마크: 파이썬 배정(assign_seats)과 NumPy 배정 커널(kernel.draw_columns) 비교
+# 실행: python benchmarks/bench_kernel.py [인원 수]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.assignment import assign_seats, build_rules, make_seat_pool  # noqa: E402
+from lottery.kernel import compile_steps, draw_columns  # noqa: E402
+from lottery.rng import make_rng, new_seed  # noqa: E402
+from lottery.rules import AssignmentPlan, validate_rules  # noqa: E402
+
+GROUPS = ['1남', '2남', '7남', '15여', '16여', '청', '2안나', '디모데', '사모회']
+
+
+# 인원에 맞춘 큰 행사장 규칙 (좌석 10% 여유, 의자 5%, 앞쪽 좌석과 특정 그룹 규칙 포함)
+def make_plan(n_persons):
+    seat_count = n_persons * 21 // 20
+    config = validate_rules({
+        'seat_count': seat_count,
+        'chair_count': n_persons // 20,
+        'front_seats': [1, seat_count // 10],
+        'special_groups': ['7남', '15여'],
+        'special_group_min_seat': seat_count // 10 + 1,
+        'special_group_overflow': 'chair',
+        'prev_front_min_seat': seat_count // 4,
+    })
+    return AssignmentPlan('bench', config)
+
+
+def make_persons(n_persons):
+    return [{'이름': f"사람{i}", '그룹': GROUPS[i % len(GROUPS)]} for i in range(n_persons)]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run_python(persons, rules, plan):
+    rng = make_rng(new_seed('mt19937'))
+    return assign_seats(persons, rules, make_seat_pool(plan), rng)
+
+
+def run_kernel(persons, rules, plan):
+    seat_pool = make_seat_pool(plan)
+    rng = make_rng(new_seed('pcg64'))
+    return draw_columns(compile_steps(rules, seat_pool), len(persons), seat_pool, rng)
+
+
+if __name__ == "__main__":
+    n_persons = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    plan = make_plan(n_persons)
+    persons = make_persons(n_persons)
+    # 지난번 앞쪽 배치자 1%
+    rules = build_rules(persons, plan, {p['이름'] for p in persons[::100]})
+
+    seats, t_python = timed(run_python, persons, rules, plan)
+    columns, t_kernel = timed(run_kernel, persons, rules, plan)
+
+    assert len(set(seats)) == n_persons
+    assert len(np.unique(columns.seat)) == n_persons and columns.seat.min() >= 0
+    print(f"{n_persons}명, 좌석 {len(plan.seats)}개")
+    print(f"파이썬 배정: {t_python * 1000:9.1f} ms  ({n_persons / t_python:12,.0f}명/초)")
+    print(f"배정 커널:   {t_kernel * 1000:9.1f} ms  ({n_persons / t_kernel:12,.0f}명/초, "
+          f"{t_python / t_kernel:.0f}배)")
@@ -0,0 +1,79 @@
+# 명단 읽기 벤치마크: pandas 전체 파싱과 openpyxl 읽기 전용 스트리밍 비교
+# 실행: python benchmarks/bench_loader.py [행 수]
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_roster import make_roster  # noqa: E402
+from lottery.roster import (  # noqa: E402
+    _prev_front_names_from_df,
+    extract_persons,
+    iter_roster,
+    read_prev_front_names,
+)
+
+
+# 명단 시트와 이전 결과 시트가 있는 업로드 파일 생성
+def make_upload(n_rows):
+    roster = make_roster(n_rows)
+    names = [v for v in roster.iloc[:, 1:-1].to_numpy().ravel() if isinstance(v, str)]
+    prev = pd.DataFrame({
+        '이름': names,
+        '랜덤값': [0] * len(names),
+        '당첨번호': list(range(1, len(names) + 1)),
+    })
+    output = io.BytesIO()
+    with pd.ExcelWriter(output) as writer:
+        roster.to_excel(writer, index=False, sheet_name='명단')
+        prev.to_excel(writer, index=False, sheet_name='이전 결과')
+    return output
+
+
+# 변경 전 방식: 두 시트를 모두 데이터프레임으로 읽은 뒤 추출
+def load_with_pandas(source):
+    xl = pd.ExcelFile(source)
+    names_df = xl.parse(xl.sheet_names[0])
+    prev_front_names = _prev_front_names_from_df(xl.parse(xl.sheet_names[1]))
+    persons = iter((p['그룹'], p['이름']) for p in extract_persons(names_df))
+    return prev_front_names, persons
+
+
+def load_streaming(source):
+    return read_prev_front_names(source), iter_roster(source)
+
+
+def run(loader, source):
+    source.seek(0)
+    start = time.perf_counter()
+    _, persons = loader(source)
+    next(persons)
+    first = time.perf_counter() - start
+    count = 1 + sum(1 for _ in persons)
+    return count, first, time.perf_counter() - start
+
+
+# 시간은 메모리 추적 없이, 최대 메모리는 따로 한 번 더 실행해서 잼
+def measure(loader, source):
+    count, first, total = run(loader, source)
+    tracemalloc.start()
+    run(loader, source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, first, total, peak
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    source = make_upload(n_rows)
+
+    print(f"행 {n_rows}개, 파일 {len(source.getvalue()) / 1e6:.1f} MB")
+    print(f"{'방식':<12}{'인원':>8}{'첫 인원(ms)':>14}{'전체(ms)':>12}{'최대 메모리(MB)':>18}")
+    for label, loader in [("pandas", load_with_pandas), ("스트리밍", load_streaming)]:
+        count, first, total, peak = measure(loader, source)
+        print(f"{label:<12}{count:>8}{first * 1000:>14.1f}{total * 1000:>12.1f}{peak / 1e6:>18.1f}")
@@ -0,0 +1,80 @@
+# 명단 추출 벤치마크: 기존 iloc 이중 루프와 벡터 연산 버전 비교
+# 실행: python benchmarks/bench_roster.py [행 수]
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.roster import extract_persons  # noqa: E402
+
+GROUPS = ['1남', '2남', '7남', '15여', '16여', '청', '2안나', '디모데', '사모회']
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN = "민서준지우현수영하은도윤예진호성연아"
+
+
+# 합성 명단 생성 (기관, 이름 열 8개, 합계 열)
+def make_roster(n_rows, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_rows):
+        group = GROUPS[(i // 20) % len(GROUPS)] if i % 20 == 0 else None
+        names = []
+        for _ in range(8):
+            roll = rng.random()
+            if roll < 0.75:
+                names.append(rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN))
+            elif roll < 0.85:
+                names.append(rng.randint(1, 99))
+            else:
+                names.append(None)
+        rows.append([group] + names + [sum(isinstance(v, str) for v in names)])
+    return pd.DataFrame(rows, columns=['기관'] + [f'명단{j}' for j in range(1, 9)] + ['합계'])
+
+
+# 변경 전 구현 (lottery_app.py의 iloc 이중 루프)
+def extract_persons_iloc(names_df):
+    persons = []
+    current_group = None
+    for i in range(len(names_df)):
+        group_cell = names_df.iloc[i, 0]
+        if pd.notna(group_cell) and isinstance(group_cell, str):
+            group_str = str(group_cell).strip()
+            if any(group_str.endswith(marker) for marker in ['남', '여', '청', '안나']) or group_str in ['디모데', '사모회']:
+                current_group = group_str
+        for j in range(1, len(names_df.columns) - 1):
+            value = names_df.iloc[i, j]
+            if pd.notna(value):
+                value_str = str(value).strip()
+                is_name = (
+                    2 <= len(value_str) <= 6 and
+                    not value_str.isdigit() and
+                    not "." in value_str and
+                    value_str not in ["기관", "합계", "명단", "NaT"] and
+                    not (value_str in ["남", "여", "청", "안나", "디모데", "사모회"])
+                )
+                if is_name and current_group:
+                    persons.append({'이름': value_str, '그룹': current_group})
+    return persons
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    df = make_roster(n_rows)
+
+    before, t_before = timed(extract_persons_iloc, df)
+    after, t_after = timed(extract_persons, df)
+
+    assert before == after, "추출 결과가 기존 구현과 다릅니다"
+    print(f"행 {n_rows}개, 추출 인원 {len(after)}명")
+    print(f"iloc 루프:  {t_before * 1000:9.1f} ms")
+    print(f"벡터 연산: {t_after * 1000:9.1f} ms  ({t_before / t_after:.0f}배)")
@@ -0,0 +1,95 @@
+# 합성 명단 파일 생성기
+# 앱에 올리는 명단과 같은 배치로 씀 (lottery.roster.iter_roster가 읽는 형식)
+# - 첫 행 머리글: 기관, 명단1..명단N, 합계
+# - 기관 열: 기관의 첫 행에만 기관명 (남/여/청/안나 접미사, 디모데, 사모회), 아래 행은 빈 칸
+# - 이름 열: 한 행에 N명씩, 기관의 마지막 행은 남는 칸이 빈 칸
+# - 합계 열: 그 행의 인원 수
+# previous=True면 두 번째 시트에 이전 결과 (이름, 랜덤값, 당첨번호)를 씀
+#
+# 실행: python benchmarks/roster_gen.py 명단_250409.xlsx --persons 5000 [--previous]
+import argparse
+import random
+
+from openpyxl import Workbook
+
+GROUPS = ['1남', '2남', '7남', '8남', '15여', '16여', '17여', '청', '2안나', '디모데', '사모회']
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+SYLLABLES = "민서준지우현수영하은도윤예진호성연아재원태경희선미혜정주유나"
+
+# 한 행의 이름 칸 수
+NAME_COLUMNS = 8
+
+
+# 겹치지 않는 이름 n개 (성 + 두세 글자, 섞인 순서)
+def make_names(n_persons, seed=0):
+    rng = random.Random(seed)
+    base = len(SYLLABLES)
+    names = []
+    for i in range(n_persons):
+        surname, rest = SURNAMES[i % len(SURNAMES)], i // len(SURNAMES)
+        given = SYLLABLES[rest % base] + SYLLABLES[rest // base % base]
+        if rest >= base * base:
+            given += SYLLABLES[rest // (base * base) % base]
+        names.append(surname + given)
+    rng.shuffle(names)
+    return names
+
+
+# 기관별 (기관명, 이름 목록), 인원은 기관마다 조금씩 다르게
+def assign_groups(names, seed=0):
+    rng = random.Random(seed)
+    shares = [rng.uniform(0.5, 1.5) for _ in GROUPS]
+    total = sum(shares)
+    groups = []
+    start = 0
+    for i, (group, share) in enumerate(zip(GROUPS, shares)):
+        stop = len(names) if i == len(GROUPS) - 1 else start + round(len(names) * share / total)
+        groups.append((group, names[start:stop]))
+        start = stop
+    return groups
+
+
+def _roster_rows(groups):
+    yield ['기관'] + [f'명단{j}' for j in range(1, NAME_COLUMNS + 1)] + ['합계']
+    for group, members in groups:
+        for offset in range(0, max(len(members), 1), NAME_COLUMNS):
+            row_names = members[offset:offset + NAME_COLUMNS]
+            cells = row_names + [None] * (NAME_COLUMNS - len(row_names))
+            yield [group if offset == 0 else None] + cells + [len(row_names)]
+
+
+# 이전 결과 시트 행 (모든 사람에게 1번부터 섞은 당첨번호)
+def _previous_rows(names, seed):
+    rng = random.Random(seed + 1)
+    seats = list(range(1, len(names) + 1))
+    rng.shuffle(seats)
+    yield ['이름', '랜덤값', '당첨번호']
+    for name, seat in zip(names, seats):
+        yield [name, round(rng.random(), 6), seat]
+
+
+# 합성 명단을 target(경로 또는 파일 객체)에 씀, 이름 목록 반환
+def write_roster(target, n_persons, previous=False, seed=0):
+    names = make_names(n_persons, seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("명단")
+    for row in _roster_rows(assign_groups(names, seed)):
+        ws.append(row)
+    if previous:
+        ws_prev = wb.create_sheet("이전 결과")
+        for row in _previous_rows(names, seed):
+            ws_prev.append(row)
+    wb.save(target)
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 명단 엑셀 파일 생성")
+    parser.add_argument("output", help="만들 명단 파일 (.xlsx)")
+    parser.add_argument("--persons", type=int, default=200, help="인원 수 (기본 200)")
+    parser.add_argument("--previous", action="store_true", help="두 번째 시트에 이전 결과 추가")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_roster(args.output, args.persons, args.previous, args.seed)
+    print(f"{args.output}: {args.persons}명{' (이전 결과 포함)' if args.previous else ''}")
@@ -0,0 +1,122 @@
+# 제비뽑기 전체 과정 벤치마크: 명단 크기별로 단계마다 걸린 시간을 재서 JSON으로 저장
+# 합성 명단(roster_gen)으로 명단 읽기 → 좌석 배정 → 결과 파일(시트별) 생성을 반복 실행하고,
+# 단계별(timing.STAGES) 가장 짧은 시간을 기록 (커밋 사이 회귀 비교용)
+# 좌석 배정 규칙은 인원에 맞춰 키운 행사장 규칙 (bench_kernel.make_plan)
+#
+# 실행: python benchmarks/run_suite.py -o 결과.json [--sizes 200 1000 10000 100000] [--repeat 3]
+#       python benchmarks/run_suite.py -o 새결과.json --compare 이전결과.json
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_kernel import make_plan  # noqa: E402
+from roster_gen import write_roster  # noqa: E402
+from lottery.draw import run_draw  # noqa: E402
+from lottery.export import create_result_excel  # noqa: E402
+from lottery.rng import new_seed  # noqa: E402
+from lottery.timing import STAGE_LABELS, StageTimer  # noqa: E402
+
+DEFAULT_SIZES = [200, 1000, 10000, 100000]
+
+DRAW_DATE = datetime(2025, 4, 9)
+
+
+# 명단 크기 하나를 repeat번 실행해 단계별 가장 짧은 시간 (ms)
+def run_case(n_persons, generator, backend, previous, repeat):
+    plan = make_plan(n_persons)
+    roster = io.BytesIO()
+    write_roster(roster, n_persons, previous)
+
+    best = {}
+    for _ in range(repeat):
+        timer = StageTimer()
+        results, diagnostics = run_draw(roster, plan, draw_date=DRAW_DATE, seed=new_seed(generator), timer=timer)
+        if results is None:
+            raise RuntimeError("\n".join(d.message for d in diagnostics))
+        create_result_excel(results, DRAW_DATE, backend=backend, timer=timer)
+        for stage, seconds in timer.items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+    return {stage: round(seconds * 1000, 3) for stage, seconds in best.items()}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _case_key(case):
+    return (case['persons'], case['generator'], case['backend'], case['previous'])
+
+
+def print_cases(cases):
+    for case in cases:
+        print(f"\n{case['persons']:>7}명  {case['generator']}, {case['backend']}"
+              f"{', 이전 결과 시트' if case['previous'] else ''}  합계 {case['total_ms']:.1f} ms")
+        for stage, ms in case['stages_ms'].items():
+            print(f"  {STAGE_LABELS.get(stage, stage):<24} {ms:10.1f} ms")
+
+
+# 같은 조건끼리 단계별 시간 비교 (새 시간 / 이전 시간)
+def print_comparison(cases, baseline):
+    before = {_case_key(case): case for case in baseline['cases']}
+    print(f"\n이전 결과({baseline.get('commit')})와 비교: 새 시간 / 이전 시간")
+    for case in cases:
+        old = before.get(_case_key(case))
+        if old is None:
+            continue
+        print(f"\n{case['persons']:>7}명  {case['generator']}, {case['backend']}")
+        for stage, ms in list(case['stages_ms'].items()) + [('합계', case['total_ms'])]:
+            old_ms = old['total_ms'] if stage == '합계' else old['stages_ms'].get(stage)
+            if old_ms:
+                print(f"  {STAGE_LABELS.get(stage, stage):<24} {old_ms:10.1f} → {ms:10.1f} ms  ({ms / old_ms:.2f}배)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="제비뽑기 단계별 벤치마크")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="명단 인원 수 (200~100000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--generator", default="sha256", help="난수 생성기 (rng.GENERATORS)")
+    parser.add_argument("--backend", default="openpyxl", help="결과 시트 작성기 (writers.RESULT_WRITERS)")
+    parser.add_argument("--no-previous", action="store_true", help="명단에 이전 결과 시트를 넣지 않음")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    cases = []
+    for n_persons in args.sizes:
+        stages = run_case(n_persons, args.generator, args.backend, not args.no_previous, args.repeat)
+        cases.append({
+            'persons': n_persons,
+            'generator': args.generator,
+            'backend': args.backend,
+            'previous': not args.no_previous,
+            'stages_ms': stages,
+            'total_ms': round(sum(stages.values()), 3),
+        })
+    print_cases(cases)
+
+    report = {
+        'commit': _git_commit(),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'cases': cases,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 파일: {args.output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(cases, json.load(f))
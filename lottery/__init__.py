@@ -0,0 +1,8 @@
+# 제비뽑기 공용 모듈 (명단 추출, 좌석 배정, 결과 파일 생성)
+# Streamlit 없이 쓸 수 있음 (명령줄 실행: python -m lottery draw 명단.xlsx)
+from .roster import dedupe_persons, extract_persons, iter_roster, read_prev_front_names, read_previous_assignments
+from .seat_pool import SeatPool
+from .assignment import SeatAssignmentError, assign_seats, build_rules, compile_rules, make_seat_pool
+from .feasibility import Shortfall, check_feasibility, describe_shortfall
+from .rules import AssignmentPlan, RuleError, available_rules, load_plan
+from .draw import Diagnostic, date_from_filename, draw_seats, read_roster, redraw_seats, run_draw, run_redraw
@@ -0,0 +1,201 @@
+# 제비뽑기 명령줄 실행 (Streamlit 없이 명단 파일로 결과 엑셀 생성)
+#
+# 실행: python -m lottery draw 명단.xlsx -o 결과.xlsx --rules lottery_app
+#       python -m lottery draw 명단.xlsx --previous 지난결과.xlsx  (바뀐 인원만 다시 배정)
+#       python -m lottery replay 명단.xlsx 결과.xlsx  (결과 파일의 난수 씨앗으로 다시 뽑아 같은지 확인)
+#       python -m lottery draw 명단.xlsx --timings 소요시간.jsonl  (단계별 소요 시간을 JSON 한 줄로 추가)
+#       python -m lottery seats --rules 규칙.json  (장소별 구역과 좌석 번호 범위 확인)
+import argparse
+import sys
+from datetime import datetime
+
+from .draw import date_from_filename, result_file_name, run_draw, run_redraw, run_replay
+from .export import create_result_excel
+from .history import DEFAULT_HISTORY_PATH, DrawHistory
+from .roster import read_result_properties
+from .rng import DEFAULT_GENERATOR, GENERATORS, KERNEL_GENERATORS, RULES_PROPERTY, format_seed, new_seed, parse_seed
+from .rules import DEFAULT_RULES, RuleError, available_rules, load_plan
+from .timing import StageTimer
+from .writers import RESULT_WRITERS
+
+
+def draw_command(args):
+    try:
+        config = load_plan(args.rules)
+    except (OSError, RuleError) as e:
+        print(f"좌석 배정 규칙 파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+    # 결과에 표시할 날짜: --date, 명단 파일명, 오늘 순서
+    if args.date:
+        file_date = datetime.strptime(args.date, '%Y-%m-%d')
+    else:
+        file_date = date_from_filename(args.roster) or datetime.now()
+
+    # 제비뽑기 기록 저장소 (지난번 앞쪽 배치자 조회, 결과 기록)
+    history = None if args.no_history else DrawHistory(args.history, preset=config.name)
+    # 난수 씨앗: --seed로 직접 정하거나 (시험용), --generator로 새로 만듦
+    seed = parse_seed(args.seed) if args.seed else new_seed(args.generator)
+    timer = StageTimer()
+    options = dict(history=history, draw_date=file_date, seed=seed, timer=timer)
+
+    try:
+        with open(args.roster, 'rb') as f:
+            if args.previous:
+                with open(args.previous, 'rb') as previous:
+                    results, diagnostics = run_redraw(f, previous, config, **options)
+            else:
+                results, diagnostics = run_draw(f, config, **options)
+    except OSError as e:
+        print(f"파일을 열 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+    # 경고와 오류는 stderr, 나머지 안내는 stdout
+    for diagnostic in diagnostics:
+        stream = sys.stderr if diagnostic.level in ('warning', 'error') else sys.stdout
+        print(diagnostic.message, file=stream)
+    if results is None:
+        return 1
+
+    output = args.output or result_file_name(file_date)
+    data = create_result_excel(results, file_date, backend=args.backend, timer=timer)
+    with timer.stage('save'):
+        with open(output, 'wb') as f:
+            f.write(data)
+    if args.timings:
+        _write_timings(args.timings, timer.json_line(
+            command='draw', rules=config.name, date=file_date.strftime('%Y-%m-%d'),
+            persons=len(results['records']), backend=args.backend, generator=seed.generator))
+
+    needed_regular = results['needed_regular_seats']
+    needed_chair = results['needed_chair_seats']
+    print(f"제비뽑기 완료! 총 {needed_regular + needed_chair}명 배정 "
+          f"({needed_regular}개 일반 좌석, {needed_chair}개 의자 좌석)")
+    print(f"결과 파일: {output}")
+    print(f"난수 씨앗: {format_seed(seed)}")
+    if results.get('weighted'):
+        print("구역 누적 횟수 가중치를 주어 뽑았습니다 (규칙의 exposure_balance).")
+    return 0
+
+
+# 단계별 소요 시간 한 줄을 파일 끝에 추가 ('-'면 표준 출력)
+def _write_timings(path, line):
+    if path == '-':
+        print(line)
+        return
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line + "\n")
+
+
+# 결과 파일에 남은 씨앗으로 다시 뽑아 결과 파일과 비교 (다르면 1 반환)
+# --rules가 없으면 결과 파일에 기록된 규칙 이름 사용
+def replay_command(args):
+    rules = args.rules
+    if rules is None:
+        try:
+            rules = read_result_properties(args.result).get(RULES_PROPERTY) or DEFAULT_RULES
+        except OSError as e:
+            print(f"결과 파일을 열 수 없습니다: {e}", file=sys.stderr)
+            return 1
+        except ValueError as e:
+            print(f"결과 파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+            return 1
+    try:
+        config = load_plan(rules)
+    except (OSError, RuleError) as e:
+        print(f"좌석 배정 규칙 파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+    history = None if args.no_history else DrawHistory(args.history, preset=config.name)
+    try:
+        with open(args.roster, 'rb') as f, open(args.result, 'rb') as result:
+            if args.previous:
+                with open(args.previous, 'rb') as previous:
+                    results, mismatches, diagnostics = run_replay(
+                        f, result, config, history=history, previous_source=previous)
+            else:
+                results, mismatches, diagnostics = run_replay(f, result, config, history=history)
+    except OSError as e:
+        print(f"파일을 열 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+    for diagnostic in diagnostics:
+        if diagnostic.level in ('warning', 'error'):
+            print(diagnostic.message, file=sys.stderr)
+    if results is None:
+        return 1
+
+    if mismatches:
+        print(f"결과가 다릅니다: {len(mismatches)}건", file=sys.stderr)
+        for name, recorded, replayed in mismatches:
+            print(f"  {name}: 결과 파일 {recorded or '-'}, 다시 뽑은 결과 {replayed or '-'}", file=sys.stderr)
+        return 1
+    print(f"결과가 같습니다: {len(results['records'])}명 (난수 씨앗 {format_seed(results['seed'])})")
+    return 0
+
+
+# 규칙의 좌석 목록: 장소별 구역마다 좌석 수와 좌석 번호 범위
+def seats_command(args):
+    try:
+        config = load_plan(args.rules)
+    except (OSError, RuleError) as e:
+        print(f"좌석 배정 규칙 파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+    inventory = config.inventory
+    print(f"{config.name}: 일반 좌석 {config['seat_count']}개, 의자 {config['chair_count']}개")
+    if inventory is None:
+        print("장소(venues)가 없는 규칙입니다 (좌석 번호 범위만 사용).")
+        return 0
+    for venue in inventory.venues:
+        print(f"\n{venue} ({inventory.count(venue)}석, {inventory.charts[venue]})")
+        for zone in inventory.zones(venue):
+            seats = inventory.find(venue, zone)
+            print(f"  {zone:<6} {len(seats):>5}석  번호 {seats[0].seat_id}~{seats[-1].seat_id}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lottery", description="제비뽑기 프로그램")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    draw = commands.add_parser("draw", help="명단 파일로 제비뽑기를 실행하고 결과 엑셀 저장")
+    draw.add_argument("roster", help="명단 엑셀 파일 (두 번째 시트: 이전 결과)")
+    draw.add_argument("-o", "--output", help="결과 파일 경로 (기본값: 제비뽑기_결과_YYYYMMDD.xlsx)")
+    draw.add_argument("--rules", "--preset", default=DEFAULT_RULES,
+                      help=f"좌석 배정 규칙 이름({', '.join(available_rules())}) 또는 규칙 파일(.json) 경로")
+    draw.add_argument("--previous", help="이전 결과 파일: 주면 기존 배정은 두고 추가/제외된 인원만 다시 배정")
+    draw.add_argument("--date", help="결과에 표시할 날짜 YYYY-MM-DD (기본값: 명단 파일명의 날짜, 없으면 오늘)")
+    draw.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="제비뽑기 기록 파일 (SQLite)")
+    draw.add_argument("--no-history", action="store_true", help="기록 저장소를 쓰지 않음 (명단 두 번째 시트 사용)")
+    draw.add_argument("--backend", default="openpyxl", choices=list(RESULT_WRITERS))
+    draw.add_argument("--generator", default=DEFAULT_GENERATOR, choices=list(GENERATORS),
+                      help=f"난수 생성기 (기본값: {DEFAULT_GENERATOR}, 암호학적으로 안전함). "
+                           f"{', '.join(sorted(KERNEL_GENERATORS))}를 고르면 NumPy 배정 커널로 뽑음 "
+                           "(명단이 아주 클 때 빠름, 기본값에서는 쓰지 않음)")
+    draw.add_argument("--seed", help="난수 씨앗 '생성기:씨앗' (시험용, 생성기를 빼면 mt19937)")
+    draw.add_argument("--timings", help="단계별 소요 시간을 JSON 한 줄로 덧붙일 파일 ('-'면 표준 출력)")
+    draw.set_defaults(handler=draw_command)
+
+    replay = commands.add_parser("replay", help="결과 파일의 난수 씨앗으로 다시 뽑아 결과가 같은지 확인")
+    replay.add_argument("roster", help="뽑을 때 쓴 명단 엑셀 파일")
+    replay.add_argument("result", help="확인할 결과 엑셀 파일")
+    replay.add_argument("--rules", "--preset",
+                        help=f"좌석 배정 규칙 이름({', '.join(available_rules())}) 또는 규칙 파일(.json) 경로 "
+                             "(기본값: 결과 파일에 기록된 규칙)")
+    replay.add_argument("--previous", help="바뀐 인원만 다시 배정한 결과면 그때 쓴 이전 결과 파일")
+    replay.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="뽑을 때 쓴 제비뽑기 기록 파일 (읽기만 함)")
+    replay.add_argument("--no-history", action="store_true", help="뽑을 때 기록 저장소를 쓰지 않았으면 지정")
+    replay.set_defaults(handler=replay_command)
+
+    seats = commands.add_parser("seats", help="규칙의 장소별 구역과 좌석 번호 범위 출력")
+    seats.add_argument("--rules", "--preset", default=DEFAULT_RULES,
+                       help=f"좌석 배정 규칙 이름({', '.join(available_rules())}) 또는 규칙 파일(.json) 경로")
+    seats.set_defaults(handler=seats_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import math
+import random
+from collections import namedtuple
+
+from .seat_pool import SeatPool
+
+# 의자 좌석 이름 (의자1, 의자2, ...)
+CHAIR_PREFIX = "의자"
+
+# 좌석 범위 (lo, hi 포함)
+# pick='random'이면 범위 안 빈 좌석에서 균등하게 뽑고, 'first'면 앞 번호부터 채움
+SeatRange = namedtuple('SeatRange', ['lo', 'hi', 'pick'], defaults=['random'])
+
+# 한 사람의 배정 규칙
+# rank가 작은 사람부터 배정하고, ranges는 앞의 범위부터 빈 좌석을 찾음
+SeatRule = namedtuple('SeatRule', ['rank', 'ranges', 'label'])
+
+# 배정 설정에서 사람과 무관한 규칙을 미리 만들어 둔 것 (compile_rules)
+# name_rules: {이름: 특정 인원 규칙}, special_groups: 특정 그룹 이름 집합,
+# prev_front_rule: 지난번 앞쪽 배치자 규칙 (없으면 None)
+RuleSet = namedtuple('RuleSet', ['name_rules', 'special_groups', 'prev_front_rule', 'group_rule', 'regular_rule'])
+
+# 규칙 순위 (좁은 제약부터 먼저 배정)
+RANK_SPECIAL_NAME = 0
+RANK_PREV_FRONT = 1
+RANK_SPECIAL_GROUP = 2
+RANK_REGULAR = 3
+
+
+class SeatAssignmentError(Exception):
+    pass
+
+
+def chair_label(number):
+    return f"{CHAIR_PREFIX}{number}"
+
+
+def is_chair(seat):
+    return isinstance(seat, str) and seat.startswith(CHAIR_PREFIX)
+
+
+# 배정 설정의 전체 좌석 (일반 좌석 1~seat_count 다음에 의자1~의자chair_count)
+def seat_list(config):
+    chairs = [chair_label(i) for i in range(1, config['chair_count'] + 1)]
+    return list(range(1, config['seat_count'] + 1)) + chairs
+
+
+# 배정 설정으로 좌석 풀 생성 (배정 계획이면 미리 만든 좌석 목록 사용)
+def make_seat_pool(config):
+    seats = getattr(config, 'seats', None)
+    return SeatPool(seats if seats is not None else seat_list(config))
+
+
+# 배정 설정으로 규칙 묶음 생성
+# config 항목 (규칙 파일 rules/*.json, 검사와 기본값은 rules.validate_rules):
+#   seat_count, chair_count        일반 좌석 수, 의자 수
+#   front_seats                    일반 인원이 먼저 채우는 앞쪽 좌석 (lo, hi), 없으면 None
+#   special_seat_ranges            {이름: (lo, hi)} 특정 인원 좌석 범위
+#   special_groups                 특정 그룹 목록
+#   special_group_min_seat         특정 그룹의 최소 좌석 번호
+#   special_group_overflow         최소 좌석 이상이 다 차면 'chair'(의자) 또는 'any'(남은 좌석)
+#   prev_front_min_seat            지난번 앞쪽 배치자의 최소 좌석 번호, 규칙이 없으면 None
+#   prev_front_draws               지난번 앞쪽 배치자를 찾을 최근 제비뽑기 기록 수 (draw.run_draw, 기본 1)
+#   exposure_balance               구역 누적 횟수로 좌석 가중치를 줄지 (draw.draw_seats, exposure 참고)
+#                                  기본값 false (균등 추첨), 켜서 뽑은 결과에는 'weighted' 표시
+#   exposure_zones                 앞/가운데 구역 마지막 좌석 번호 (front_last, middle_last), 없으면 일반 좌석 3등분
+#   venues                         ((장소 이름, 좌석 배치표), ...) 여러 장소 좌석 (inventory), 없으면 None
+#                                  좌석 수는 배치표에서 세고, 좌석 번호는 장소 순서대로 이어짐
+def compile_rules(config):
+    seat_count = config['seat_count']
+    chairs = []
+    if config['chair_count'] > 0:
+        chairs = [SeatRange(chair_label(1), chair_label(config['chair_count']), 'first')]
+    all_seats = SeatRange(1, seat_count)
+
+    prev_front_min = config.get('prev_front_min_seat')
+    front = config.get('front_seats')
+
+    group_ranges = [SeatRange(config.get('special_group_min_seat', 1), seat_count)]
+    if config.get('special_group_overflow', 'chair') == 'any':
+        group_ranges.append(all_seats)
+    group_rule = SeatRule(RANK_SPECIAL_GROUP, tuple(group_ranges + chairs), "특정 그룹")
+
+    regular_ranges = [SeatRange(*front)] if front else []
+    regular_rule = SeatRule(RANK_REGULAR, tuple(regular_ranges + [all_seats] + chairs), "일반")
+
+    prev_front_rule = None
+    if prev_front_min is not None:
+        prev_front_rule = SeatRule(
+            RANK_PREV_FRONT, tuple([SeatRange(prev_front_min, seat_count)] + chairs), "지난번 앞쪽 배치자"
+        )
+
+    name_rules = {
+        name: SeatRule(RANK_SPECIAL_NAME, (SeatRange(lo, hi),), f"특정 인원 {name}")
+        for name, (lo, hi) in config.get('special_seat_ranges', {}).items()
+    }
+    return RuleSet(name_rules, frozenset(config.get('special_groups', ())), prev_front_rule, group_rule, regular_rule)
+
+
+# 배정 설정과 지난번 앞쪽 배치자로 사람별 배정 규칙 생성
+# config가 규칙 파일로 만든 배정 계획(rules.AssignmentPlan)이면 미리 만든 규칙 묶음을 그대로 씀
+def build_rules(persons, config, prev_front_names=()):
+    rule_set = getattr(config, 'rule_set', None) or compile_rules(config)
+    name_rules = rule_set.name_rules
+    special_groups = rule_set.special_groups
+    prev_front_rule = rule_set.prev_front_rule
+
+    rules = []
+    for person in persons:
+        name = person['이름']
+        if name in name_rules:
+            rules.append(name_rules[name])
+        elif prev_front_rule is not None and name in prev_front_names:
+            rules.append(prev_front_rule)
+        elif person['그룹'] in special_groups:
+            rules.append(rule_set.group_rule)
+        else:
+            rules.append(rule_set.regular_rule)
+    return rules
+
+
+# 좌석이 규칙의 범위 중 하나에 들어가는지 확인 (빈 좌석인지는 보지 않음)
+def rule_allows(rule, seat_pool, seat):
+    pos = seat_pool.position(seat)
+    for seat_range in rule.ranges:
+        start, stop = seat_pool.span(seat_range.lo, seat_range.hi)
+        if start <= pos < stop:
+            return True
+    return False
+
+
+# 모든 사람을 한 번에 배정
+# 규칙 순위와 무작위 키로 한 번 정렬한 뒤, 각자 자기 범위의 빈 좌석에서 균등하게 뽑음
+# 같은 순위 안에서는 순서와 좌석이 모두 무작위라 결과가 균등함 (전체 O(n log n))
+# weights: 사람별 가중치 (없으면 균등), 주면 같은 규칙끼리 뽑힌 좌석을 가중치 순서로 다시 나눔
+# keys: 사람별 무작위 키 (없으면 rng로 만듦), 같은 순위 안의 배정 순서
+def assign_seats(persons, rules, seat_pool, rng=random, weights=None, keys=None):
+    if keys is None:
+        keys = [rng.random() for _ in persons]
+    order = sorted(range(len(persons)), key=lambda i: (rules[i].rank, keys[i]))
+    seats = [None] * len(persons)
+
+    for i in order:
+        seat = None
+        for seat_range in rules[i].ranges:
+            if seat_range.pick == 'first':
+                seat = seat_pool.first(seat_range.lo, seat_range.hi)
+            else:
+                seat = seat_pool.sample(seat_range.lo, seat_range.hi, rng)
+            if seat is not None:
+                break
+        if seat is None:
+            raise SeatAssignmentError(
+                f"{persons[i]['이름']}({rules[i].label})에게 배정할 수 있는 좌석이 없습니다!"
+            )
+        seat_pool.reserve(seat)
+        seats[i] = seat
+
+    if weights is not None:
+        _weighted_reorder(seats, rules, seat_pool, weights, rng)
+    return seats
+
+
+# 같은 규칙을 가진 사람들이 받은 좌석을 가중치에 따라 다시 나눔 (seats를 바로 수정)
+# 규칙별로 좌석 집합은 그대로 두고(제약과 좌석 분포 유지), 사람 순서만 가중 무작위로 정해
+# 앞 좌석부터 차례로 줌: 가중치가 클수록 앞 좌석을 받을 가능성이 큼
+# 순서는 Efraimidis–Spirakis 키 u^(1/w) (로그로 log(u)/w) 내림차순이라 가중치가 같으면 균등한 순열과 같음
+# 전체 O(n log n)
+def _weighted_reorder(seats, rules, seat_pool, weights, rng):
+    classes = {}
+    for i, rule in enumerate(rules):
+        classes.setdefault(rule, []).append(i)
+
+    for members in classes.values():
+        if len(members) < 2:
+            continue
+        class_seats = sorted((seats[i] for i in members), key=seat_pool.position)
+        order = sorted(members, key=lambda i: math.log(1.0 - rng.random()) / weights[i], reverse=True)
+        for i, seat in zip(order, class_seats):
+            seats[i] = seat
@@ -0,0 +1,407 @@
+import os
+import traceback
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from .assignment import SeatAssignmentError, assign_seats, build_rules, is_chair, make_seat_pool, rule_allows
+from .feasibility import check_feasibility, describe_shortfall
+from .roster import (
+    dedupe_persons,
+    iter_roster,
+    read_prev_front_names,
+    read_previous_assignments,
+    read_result_properties,
+)
+from .exposure import exposure_weights
+from .timing import StageTimer
+from .rng import DATE_PROPERTY, KERNEL_GENERATORS, SEED_PROPERTY, make_rng, new_seed, parse_seed
+
+# 제비뽑기 실행 (명단 읽기 → 좌석 배정 → 결과 정리)
+# Streamlit 없이 쓸 수 있도록 안내/오류 메시지는 화면에 바로 출력하지 않고 목록으로 돌려줌
+
+# 안내 메시지
+# level: 'write'(일반 안내), 'info', 'warning', 'error' (앱에서는 같은 이름의 st 함수로 표시)
+Diagnostic = namedtuple('Diagnostic', ['level', 'message'])
+
+# 파일명에서 날짜를 찾을 때 시도하는 형식
+DATE_FORMATS = [
+    '%Y-%m-%d',  # 2025-04-01
+    '%Y%m%d',    # 20250401
+    '%Y_%m_%d',  # 2025_04_01
+    '%y%m%d',    # 250401
+    '%m%d',      # 0401 (당해 연도 사용)
+    '%m-%d',     # 04-01
+    '%m_%d'      # 04_01
+]
+
+
+# 파일명(경로 가능)에서 날짜 추출, 찾지 못하면 None
+def date_from_filename(filename):
+    name = os.path.splitext(os.path.basename(filename))[0]
+
+    for date_format in DATE_FORMATS:
+        try:
+            extracted_date = datetime.strptime(name, date_format)
+        except ValueError:
+            continue
+        if date_format == '%y%m%d':  # YY년MM월DD일 형식
+            # 20XX년으로 설정
+            if extracted_date.year < 100:
+                extracted_date = extracted_date.replace(year=extracted_date.year + 2000)
+        elif '%Y' not in date_format:  # 월, 일만 있는 형식
+            # 현재 연도 추가
+            extracted_date = extracted_date.replace(year=datetime.now().year)
+        return extracted_date
+
+    # 직접 패턴 매칭 시도 (예: 250409 형식)
+    if len(name) == 6 and name.isdigit():
+        yy, mm, dd = int(name[0:2]), int(name[2:4]), int(name[4:6])
+        if 1 <= mm <= 12 and 1 <= dd <= 31:  # 날짜 유효성 검사
+            try:
+                return datetime(2000 + yy, mm, dd)
+            except ValueError:
+                pass
+    return None
+
+
+# 결과 파일 이름 (제비뽑기_결과_20250409.xlsx)
+def result_file_name(file_date):
+    return f"제비뽑기_결과_{file_date.strftime('%Y%m%d')}.xlsx"
+
+
+# 명단 파일에서 중복을 제거한 사람 목록과 지난번 앞쪽 배치자 이름 읽기
+# 지난번 앞쪽 배치자 규칙이 없는 설정이거나 prev_front가 False(기록 저장소 사용)면 두 번째 시트를 읽지 않음
+def read_roster(source, config, prev_front=True):
+    prev_front_names = set()
+    if prev_front and config.get('prev_front_min_seat') is not None:
+        # 두 번째 시트(이전 결과)의 당첨번호, 이름 열만 읽음
+        prev_front_names = read_prev_front_names(source)
+
+    # 명단을 한 행씩 읽어 이름과 그룹 정보를 추출
+    # 중복 제거 (동명이인은 유지 - 그룹과 함께 고려)
+    persons = dedupe_persons(
+        {'이름': name, '그룹': group} for group, name in iter_roster(source)
+    )
+    return persons, prev_front_names
+
+
+# 구역 누적 횟수로 사람별 가중치 (설정의 exposure_balance가 꺼져 있거나 횟수가 없으면 None: 균등)
+def _placement_weights(persons, config, exposure):
+    if not config.get('exposure_balance') or exposure is None:
+        return None
+    return exposure_weights(persons, exposure)
+
+
+# 사람 목록에 좌석 배정
+# exposure: 사람별 구역 누적 횟수 (history.DrawHistory.exposure), 있으면 앞/뒤 좌석이 고르게 돌아가도록 가중치를 줌
+# seed: 난수 씨앗 (rng.DrawSeed), 없으면 새로 만듦. 배정 순서, 좌석, 랜덤값 모두 이 씨앗의 생성기 하나로 뽑으므로
+#       같은 명단, 설정, 씨앗이면 결과가 항상 같음
+# 결과: {'records': 이름순 [{'이름', '랜덤값', '당첨번호'}], 'names', 'needed_regular_seats', 'needed_chair_seats',
+#        'seed', 'rules'(규칙 이름), 'weighted'(구역 누적 횟수 가중치를 줬는지)},
+#        커널로 배정했으면 'columns' (kernel.DrawColumns, persons 순서)
+# 배정할 수 없으면 None을 반환하고 이유를 diagnostics에 추가
+def draw_seats(persons, config, prev_front_names=(), diagnostics=None, exposure=None, seed=None):
+    if diagnostics is None:
+        diagnostics = []
+    seed = seed or new_seed()
+
+    # 사람별 배정 규칙 생성 후 한 번에 좌석 배정
+    seat_pool = make_seat_pool(config)
+    rules = build_rules(persons, config, prev_front_names)
+
+    # 좌석 수와 명단 수 확인
+    if len(persons) > len(seat_pool):
+        diagnostics.append(Diagnostic('error', f"명단({len(persons)}명)이 좌석 수({len(seat_pool)}개)보다 많습니다."))
+        return None
+
+    # 좌석을 뽑기 전에 모든 제약을 만족할 수 있는지 확인
+    shortfall = check_feasibility(rules, seat_pool)
+    if shortfall:
+        diagnostics.append(Diagnostic('error', describe_shortfall(shortfall)))
+        return None
+
+    weights = _placement_weights(persons, config, exposure)
+    try:
+        seats, random_values, columns = _assign(persons, rules, seat_pool, seed, weights)
+    except SeatAssignmentError as e:
+        diagnostics.append(Diagnostic('error', str(e)))
+        return None
+
+    results = _draw_results(persons, random_values, seats, seed, config)
+    results['weighted'] = weights is not None
+    if columns is not None:
+        results['columns'] = columns
+    return results
+
+
+# 씨앗의 생성기 하나로 좌석 배정: (사람별 좌석, 사람별 랜덤값, 커널 결과 또는 None)
+# 랜덤값은 같은 순위 안의 배정 순서를 정한 무작위 키
+# NumPy 생성기(rng.KERNEL_GENERATORS)면 배열 연산 커널(kernel)로 배정하고 사람별 좌석 위치 배열도 돌려줌
+def _assign(persons, rules, seat_pool, seed, weights):
+    rng = make_rng(seed)
+    if seed.generator in KERNEL_GENERATORS:
+        from .kernel import compile_steps, draw_columns
+
+        columns = draw_columns(compile_steps(rules, seat_pool), len(persons), seat_pool, rng, weights)
+        seats = seat_pool.seats
+        return [seats[i] for i in columns.seat.tolist()], columns.key.tolist(), columns
+    keys = [rng.random() for _ in persons]
+    return assign_seats(persons, rules, seat_pool, rng, weights, keys), keys, None
+
+
+# 사람별 랜덤값, 좌석으로 결과 정리
+def _draw_results(persons, random_values, seats, seed, config):
+    # 결과 목록 (이름 기준으로 정렬, 가나다순)
+    records = sorted(
+        ({'이름': p['이름'], '그룹': p['그룹'], '랜덤값': value, '당첨번호': seat}
+         for p, value, seat in zip(persons, random_values, seats)),
+        key=lambda record: record['이름']
+    )
+
+    # 장소가 여럿이면 좌석마다 장소와 그 장소 배치표의 좌석 이름 ('별관 12')
+    inventory = getattr(config, 'inventory', None)
+    if inventory is not None and len(inventory.venues) > 1:
+        for record in records:
+            record['장소'] = inventory[record['당첨번호']].venue
+            record['좌석'] = inventory.label(record['당첨번호'])
+
+    # 필요한 의자 좌석 수 계산
+    needed_chair_seats = sum(1 for seat in seats if is_chair(seat))
+
+    return {
+        'records': records,
+        'names': [p['이름'] for p in persons],
+        'needed_regular_seats': len(seats) - needed_chair_seats,
+        'needed_chair_seats': needed_chair_seats,
+        'seed': seed,
+        'rules': getattr(config, 'name', None),
+        'inventory': inventory,
+    }
+
+
+# 이전 결과의 배정을 유지하고 바뀐 인원만 다시 배정
+# previous: 이전 결과 [(당첨번호, 이름)] (roster.read_previous_assignments)
+# 이름별로 이전 결과와 새 명단을 짝지어
+# - 남은 사람은 지금 규칙(특정 인원, 지난번 앞쪽 배치자 등)의 범위에 드는 좌석이면 그대로 두고, 빠진 사람의 좌석은 비움
+# - 규칙에 맞지 않는 좌석, 이름만으로 누구 좌석인지 알 수 없는 동명이인은 경고를 남기고 다시 배정
+# - 새로 들어온 사람만 같은 규칙으로 빈 좌석에 배정 (제약 확인과 배정 모두 추가 인원에만 비례)
+# 결과: draw_seats와 같은 형태에 'added', 'removed' (이름 목록) 추가
+def redraw_seats(persons, previous, config, prev_front_names=(), diagnostics=None, exposure=None, seed=None):
+    if diagnostics is None:
+        diagnostics = []
+    seed = seed or new_seed()
+
+    seat_pool = make_seat_pool(config)
+
+    # 이름별 이전 좌석 (같은 이름이 여러 명이면 모두)
+    previous_seats = {}
+    for seat, name in previous:
+        previous_seats.setdefault(name, []).append(seat)
+
+    # 이전 결과 파일에는 그룹이 없으므로 이름이 겹치면 누구 좌석인지 추측하지 않음
+    roster_counts = Counter(p['이름'] for p in persons)
+    ambiguous = {name for name, name_seats in previous_seats.items()
+                 if len(name_seats) > 1 or roster_counts[name] > 1}
+    for name in sorted(ambiguous):
+        if roster_counts[name]:
+            diagnostics.append(Diagnostic(
+                'warning', f"이름이 같은 {name}의 이전 좌석을 누구 것인지 알 수 없어 모두 다시 배정합니다."))
+
+    rules = build_rules(persons, config, prev_front_names)
+    seats = [None] * len(persons)
+    added = []  # 새로 배정할 사람의 위치 (persons 기준)
+    for i, person in enumerate(persons):
+        name = person['이름']
+        name_seats = previous_seats.get(name)
+        if not name_seats or name in ambiguous:
+            added.append(i)
+            continue
+        seat = name_seats.pop(0)
+        if seat in seat_pool and rule_allows(rules[i], seat_pool, seat):
+            seat_pool.reserve(seat)
+            seats[i] = seat
+        else:
+            # 지금 좌석 배치에 없거나, 이미 다른 사람이 앉았거나, 지금 규칙의 범위 밖인 좌석
+            diagnostics.append(Diagnostic('warning', f"{name}의 이전 좌석 {seat}번을 쓸 수 없어 다시 배정합니다."))
+            added.append(i)
+    # 빠진 사람: 짝이 없는 이전 좌석 (동명이인은 이전 결과에 더 많았던 만큼)
+    removed = []
+    for name, name_seats in previous_seats.items():
+        left = len(name_seats) - roster_counts[name] if name in ambiguous else len(name_seats)
+        removed.extend([name] * left)
+
+    added_persons = [persons[i] for i in added]
+    rules = [rules[i] for i in added]
+
+    # 빈 좌석 수 확인
+    if len(added_persons) > len(seat_pool):
+        diagnostics.append(Diagnostic('error', f"새로 배정할 인원({len(added_persons)}명)이 빈 좌석 수({len(seat_pool)}개)보다 많습니다."))
+        return None
+
+    # 남은 빈 좌석으로 새 인원의 제약을 모두 만족할 수 있는지 확인
+    shortfall = check_feasibility(rules, seat_pool)
+    if shortfall:
+        diagnostics.append(Diagnostic('error', describe_shortfall(shortfall)))
+        return None
+
+    # 랜덤값은 새로 배정한 사람만 (이전 결과 파일에는 없음)
+    weights = _placement_weights(added_persons, config, exposure)
+    try:
+        added_seats, added_values, _ = _assign(added_persons, rules, seat_pool, seed, weights)
+    except SeatAssignmentError as e:
+        diagnostics.append(Diagnostic('error', str(e)))
+        return None
+
+    random_values = [None] * len(persons)
+    for i, seat, value in zip(added, added_seats, added_values):
+        seats[i] = seat
+        random_values[i] = value
+
+    results = _draw_results(persons, random_values, seats, seed, config)
+    results['weighted'] = weights is not None
+    results['added'] = [p['이름'] for p in added_persons]
+    results['removed'] = removed
+    return results
+
+
+# 명단 읽기, 기록 저장소가 있으면 지난번 앞쪽 배치자는 저장소의 최근 기록에서 찾음
+# (저장소에 draw_date 이전 기록이 없으면 명단 두 번째 시트 사용)
+def _read_persons(source, config, reader, history, draw_date, diagnostics, timer):
+    prev_front_names = None
+    if history is not None and config.get('prev_front_min_seat') is not None:
+        with timer.stage('history'):
+            prev_front_names = history.prev_front_names(before=draw_date, last_n=config.get('prev_front_draws', 1))
+
+    with timer.stage('roster'):
+        persons, sheet_prev_front_names = reader(source, config, prev_front_names is None)
+    diagnostics.append(Diagnostic('write', f"명단에서 추출된 인원: {len(persons)}명"))
+    if prev_front_names is None:
+        return persons, sheet_prev_front_names
+    diagnostics.append(Diagnostic('write', f"제비뽑기 기록에서 찾은 지난번 앞쪽 배치자: {len(prev_front_names)}명"))
+    return persons, prev_front_names
+
+
+# draw_date 이전 기록의 구역 누적 횟수 (같은 날짜를 다시 뽑거나 다시 실행해도 뽑을 때와 같은 횟수)
+def _exposure(history, draw_date, config, timer):
+    if history is None:
+        return None
+    with timer.stage('history'):
+        return history.exposure(before=draw_date, config=config)
+
+
+# 명단 파일 하나로 제비뽑기 실행: (결과 또는 None, 안내 메시지 목록)
+# reader: read_roster와 같은 (source, config, prev_front) -> (persons, prev_front_names) 함수 (앱의 캐시 등)
+# history: 기록 저장소 (history.DrawHistory), 있으면 지난번 앞쪽 배치자와 구역 누적 횟수를 찾고
+#          끝난 결과를 draw_date로 기록
+# seed: 난수 씨앗 (rng.DrawSeed), 없으면 새로 만듦 (결과의 'seed'를 결과 파일에 남겨 두면 run_replay로 다시 만들 수 있음)
+# timer: 단계별 소요 시간을 모을 timing.StageTimer (명단 읽기, 기록 조회, 좌석 배정, 기록 저장)
+def run_draw(source, config, reader=read_roster, history=None, draw_date=None, seed=None, timer=None):
+    diagnostics = []
+    draw_date = draw_date or datetime.now()
+    if timer is None:
+        timer = StageTimer()
+    try:
+        persons, prev_front_names = _read_persons(source, config, reader, history, draw_date, diagnostics, timer)
+        exposure = _exposure(history, draw_date, config, timer)
+        with timer.stage('assign'):
+            results = draw_seats(persons, config, prev_front_names, diagnostics, exposure, seed)
+        if results is not None and history is not None:
+            with timer.stage('record'):
+                history.record_draw(results['records'], draw_date, config)
+        return results, diagnostics
+    except Exception as e:
+        diagnostics.append(Diagnostic('error', f"오류 발생: {e}"))
+        diagnostics.append(Diagnostic('error', traceback.format_exc()))
+        return None, diagnostics
+
+
+# 명단 파일과 이전 결과 파일로 바뀐 인원만 다시 배정: (결과 또는 None, 안내 메시지 목록)
+def run_redraw(source, previous_source, config, reader=read_roster, history=None, draw_date=None, seed=None,
+               timer=None):
+    diagnostics = []
+    draw_date = draw_date or datetime.now()
+    if timer is None:
+        timer = StageTimer()
+    try:
+        persons, prev_front_names = _read_persons(source, config, reader, history, draw_date, diagnostics, timer)
+        try:
+            with timer.stage('roster'):
+                previous = read_previous_assignments(previous_source)
+        except ValueError as e:
+            # 이전 결과 파일 형식 문제 (시트나 머리글 없음)
+            diagnostics.append(Diagnostic('error', str(e)))
+            return None, diagnostics
+        diagnostics.append(Diagnostic('write', f"이전 결과: {len(previous)}명"))
+        exposure = _exposure(history, draw_date, config, timer)
+        with timer.stage('assign'):
+            results = redraw_seats(persons, previous, config, prev_front_names, diagnostics, exposure, seed)
+        if results is not None:
+            diagnostics.append(Diagnostic('write', f"새로 배정: {len(results['added'])}명, 좌석 비움: {len(results['removed'])}명"))
+            if history is not None:
+                with timer.stage('record'):
+                    history.record_draw(results['records'], draw_date, config)
+        return results, diagnostics
+    except Exception as e:
+        diagnostics.append(Diagnostic('error', f"오류 발생: {e}"))
+        diagnostics.append(Diagnostic('error', traceback.format_exc()))
+        return None, diagnostics
+
+
+# 결과 파일에 남긴 씨앗으로 제비뽑기를 다시 실행해 결과 파일과 같은지 확인 (감사용)
+# source: 뽑을 때 쓴 명단 파일, result_source: 확인할 결과 파일
+# previous_source: 바뀐 인원만 다시 배정한 결과면 그때 쓴 이전 결과 파일
+# history: 뽑을 때 기록 저장소를 썼으면 같은 저장소 (결과 날짜 이전 기록만 씀)
+# 결과: (다시 뽑은 결과 또는 None, 다른 좌석 [(이름, 결과 파일 좌석, 다시 뽑은 좌석)], 안내 메시지 목록)
+def run_replay(source, result_source, config, reader=read_roster, history=None, previous_source=None):
+    try:
+        properties = read_result_properties(result_source)
+        recorded = read_previous_assignments(result_source)
+    except ValueError as e:
+        return None, [], [Diagnostic('error', str(e))]
+    if SEED_PROPERTY not in properties:
+        return None, [], [Diagnostic('error', "결과 파일에 난수 씨앗이 기록되어 있지 않습니다.")]
+    seed = parse_seed(properties[SEED_PROPERTY])
+    draw_date = properties.get(DATE_PROPERTY) or datetime.now()
+    if isinstance(draw_date, str):
+        draw_date = datetime.strptime(draw_date, '%Y-%m-%d')
+
+    # 다시 뽑은 결과는 기록하지 않음
+    options = dict(reader=reader, draw_date=draw_date, seed=seed)
+    if history is not None:
+        options['history'] = _ReadOnlyHistory(history)
+    if previous_source is None:
+        results, diagnostics = run_draw(source, config, **options)
+    else:
+        results, diagnostics = run_redraw(source, previous_source, config, **options)
+    if results is None:
+        return None, [], diagnostics
+
+    # 이름별 좌석 비교 (동명이인은 좌석 순서로 짝지음)
+    expected = {}
+    for seat, name in recorded:
+        expected.setdefault(name, []).append(str(seat))
+    actual = {}
+    for record in results['records']:
+        actual.setdefault(record['이름'], []).append(str(record['당첨번호']))
+    mismatches = []
+    for name in sorted(set(expected) | set(actual)):
+        want, got = sorted(expected.get(name, [])), sorted(actual.get(name, []))
+        for i in range(max(len(want), len(got))):
+            if i >= len(want) or i >= len(got) or want[i] != got[i]:
+                mismatches.append((name, want[i] if i < len(want) else None, got[i] if i < len(got) else None))
+    return results, mismatches, diagnostics
+
+
+# 조회만 하고 기록은 하지 않는 기록 저장소 (다시 실행할 때 저장소를 바꾸지 않도록)
+class _ReadOnlyHistory:
+    def __init__(self, history):
+        self._history = history
+
+    def prev_front_names(self, *args, **kwargs):
+        return self._history.prev_front_names(*args, **kwargs)
+
+    def exposure(self, *args, **kwargs):
+        return self._history.exposure(*args, **kwargs)
+
+    def record_draw(self, *args, **kwargs):
+        return None
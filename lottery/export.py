@@ -0,0 +1,258 @@
+import io
+import logging
+import os
+import zipfile
+from copy import copy
+from datetime import datetime
+
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.exceptions import InvalidFileException
+
+from .rng import DATE_PROPERTY, RULES_PROPERTY, SEED_PROPERTY, WEIGHTING_PROPERTY, WEIGHTING_VALUE, format_seed
+from .template import load_seat_index, load_template, load_template_package
+from .timing import StageTimer
+from .transplant import TRANSPLANT_ERRORS, transplant_sheet
+from .writers import RESULT_WRITERS
+
+log = logging.getLogger(__name__)
+
+# 좌석 배치표 템플릿을 읽을 수 없을 때 나는 오류 (셀 단위 복사 경로)
+TEMPLATE_ERRORS = (OSError, zipfile.BadZipFile, KeyError, ValueError, InvalidFileException)
+
+# 앱 디렉토리에 있는 좌석 배치표 파일
+SEATING_CHART_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "seating_chart.xlsx")
+
+# 픽셀을 Excel 열 너비 단위로 정확하게 변환하는 함수
+def pixels_to_excel_width(pixels):
+    # 공식: Excel 열 너비 = (픽셀 - 셀 패딩) / 문자 폭 계수
+    padding = 5
+    char_width = 9.5  # 81픽셀에서 61픽셀로 줄이기 위해 조정된 값
+    
+    return (pixels - padding) / char_width
+
+# 좌석 배치표 열 너비 (픽셀 기준)
+SEATING_CHART_COLUMN_PIXELS = {
+    'A': 38,     # A열: 38픽셀
+    'B': 61,     # B열: 61픽셀
+    'C': 61,     # C열: 61픽셀
+    'D': 15,     # D열: 15픽셀
+    'E': 61,     # E열: 61픽셀
+    'F': 61,     # F열: 61픽셀
+    'G': 61,     # G열: 61픽셀
+    'H': 15,     # H열: 15픽셀
+    'I': 61,     # I열: 61픽셀
+    'J': 61,     # J열: 61픽셀
+    'K': 61,     # K열: 61픽셀
+    'L': 15,     # L열: 15픽셀
+    'M': 61,     # M열: 61픽셀
+    'N': 61,     # N열: 61픽셀
+    'O': 61,     # O열: 61픽셀
+    'P': 15,     # P열: 15픽셀
+    'Q': 61,     # Q열: 61픽셀
+    'R': 61,     # R열: 61픽셀
+    'S': 61      # S열: 61픽셀
+}
+
+# 좌석 배치표 열 너비 계산 (정할 너비가 없으면 None)
+def seating_column_width(col_letter, src_width):
+    if col_letter in SEATING_CHART_COLUMN_PIXELS:
+        # 미리 계산된 특정 픽셀 값으로 설정
+        return pixels_to_excel_width(SEATING_CHART_COLUMN_PIXELS[col_letter])
+    if src_width:
+        # 다른 열은 원본과 동일한 비율로 설정
+        # 원본 너비에 보정 계수 적용 (61/81 ≈ 0.75)
+        return src_width * 0.75
+    return None
+
+# 결과 엑셀 파일 생성 함수
+# file_date: 결과에 표시할 날짜 (없으면 오늘)
+# transplant: True면 좌석 배치표 시트를 템플릿 파일에서 통째로 옮겨 심고,
+#             False이거나 실패하면 셀 단위로 복사
+# backend: 결과 시트 작성기 (RESULT_WRITERS의 이름)
+#   'openpyxl'            일반 워크북 (기본값)
+#   'openpyxl-write-only' 쓰기 전용 워크북에 행 순서대로 써서 인원수와 관계없이 메모리 사용량이 일정함
+#   'xlsxwriter'          XlsxWriter constant_memory 모드 (가장 빠름, xlsxwriter 패키지 필요)
+# seat_names: True면 좌석 배치표의 좌석 칸에 번호 대신 앉을 사람 이름을 채움 (빈 좌석은 번호)
+# 장소가 있는 규칙의 결과(results['inventory'])면 장소마다 그 장소의 배치표를 시트로 추가
+# 결과에 난수 씨앗이 있으면 씨앗, 규칙 이름, 날짜를 문서 속성에 남김 (draw.run_replay로 다시 실행할 때 읽음)
+# timer: 단계별 소요 시간을 모을 timing.StageTimer (결과 시트 작성, 좌석 배치표 복사, 파일 저장)
+def create_result_excel(results, file_date=None, transplant=True, backend='openpyxl', seat_names=True, timer=None):
+    if timer is None:
+        timer = StageTimer()
+
+    # 이름순 결과 목록 (draw.draw_seats의 records)
+    records = results['records']
+    
+    # 날짜 설정
+    if file_date is None:
+        file_date = datetime.now()
+    today = file_date.strftime('%Y년 %m월 %d일')
+    
+    data = RESULT_WRITERS[backend](records, today, result_properties(results, file_date), timer)
+    with timer.stage('seating_chart'):
+        charts = seating_charts(records, results.get('inventory'), seat_names)
+    for path, title, cell_values in charts:
+        data = _add_seating_chart(data, transplant, cell_values, timer, path, title)
+    return data
+
+
+# 결과 파일 문서 속성 {이름: 문자열} (씨앗이 없는 결과면 None)
+def result_properties(results, file_date):
+    if not results.get('seed'):
+        return None
+    properties = {SEED_PROPERTY: format_seed(results['seed']), DATE_PROPERTY: file_date.strftime('%Y-%m-%d')}
+    if results.get('rules'):
+        properties[RULES_PROPERTY] = results['rules']
+    if results.get('weighted'):
+        properties[WEIGHTING_PROPERTY] = WEIGHTING_VALUE
+    return properties
+
+
+# 좌석 배치표의 좌석 칸에 쓸 값 {셀 주소: 이름 또는 좌석 번호}
+# 좌석 번호는 앞 좌석 + 1 수식으로 이어져 있어 이름을 넣으면 뒤 좌석 번호가 깨지므로
+# 빈 좌석도 수식 대신 번호 값을 씀 (좌석 → 셀 색인은 템플릿 파일이 바뀔 때만 다시 만듦)
+def seat_cell_values(records):
+    seat_index = load_seat_index(SEATING_CHART_PATH)
+    names = {record['당첨번호']: record['이름'] for record in records}
+    return {ref: names.get(seat, number) for seat, (ref, number) in seat_index.items()}
+
+
+# 결과 파일에 넣을 좌석 배치표 [(배치표 경로, 시트 이름, 좌석 칸 값 또는 None)]
+# inventory가 없으면 앱 디렉토리의 좌석 배치표 하나, 있으면 장소마다 하나 ('좌석 배치표 (별관)')
+def seating_charts(records, inventory=None, seat_names=True):
+    if inventory is None:
+        return [(SEATING_CHART_PATH, "좌석 배치표", seat_cell_values(records) if seat_names else None)]
+
+    names = {record['당첨번호']: record['이름'] for record in records} if seat_names else {}
+    charts = []
+    for venue in inventory.venues:
+        title = "좌석 배치표" if len(inventory.venues) == 1 else f"좌석 배치표 ({venue})"[:31]
+        cell_values = {
+            seat.attributes['ref']: names.get(seat.seat_id, seat.attributes['number'])
+            for seat in inventory.find(venue)
+        } if seat_names else None
+        charts.append((inventory.charts[venue], title, cell_values))
+    return charts
+
+
+# 배치표의 열 너비 계산: 앱 디렉토리의 좌석 배치표는 정해 둔 픽셀 너비, 다른 배치표는 원본 비율
+def _column_width(path):
+    if path == SEATING_CHART_PATH:
+        return seating_column_width
+    return lambda col_letter, src_width: src_width * 0.75 if src_width else None
+
+
+# xlsx 바이트에 좌석 배치표(path)를 마지막 시트(title)로 추가
+# (옮겨 심기는 압축 파일을 다시 쓰는 것까지 모두 좌석 배치표 복사 시간으로 셈)
+def _add_seating_chart(data, transplant, cell_values=None, timer=None, path=SEATING_CHART_PATH, title="좌석 배치표"):
+    if timer is None:
+        timer = StageTimer()
+    if transplant:
+        try:
+            with timer.stage('seating_chart'):
+                # 좌석 배치표 (프로세스당 한 번 읽어 둔 캐시 사용)
+                package = load_template_package(path)
+                return transplant_sheet(data, package, title, _column_width(path), cell_values)
+        except TRANSPLANT_ERRORS as e:
+            log.warning("좌석 배치표(%s)를 옮겨 심을 수 없어 셀 단위 복사로 전환: %r", path, e)
+    
+    with timer.stage('seating_chart'):
+        # 셀 단위 복사 경로에서만 씀
+        from openpyxl import load_workbook
+        
+        wb = load_workbook(io.BytesIO(data))
+        add_seating_chart_sheet(wb, cell_values, path, title)
+    
+    # 엑셀 파일을 바이트로 변환
+    with timer.stage('save'):
+        output = io.BytesIO()
+        wb.save(output)
+        return output.getvalue()
+
+
+# 좌석 배치표를 셀 단위로 복사해 wb의 마지막 시트로 추가
+# cell_values: 복사한 뒤 바꿀 셀 값 {셀 주소: 값} (seat_cell_values)
+# path, title: 복사할 좌석 배치표 파일과 새 시트 이름
+def add_seating_chart_sheet(wb, cell_values=None, path=SEATING_CHART_PATH, title="좌석 배치표"):
+    # 이미지 복사용 (Pillow를 불러오므로 이 경로에서만)
+    from openpyxl.drawing.image import Image
+    
+    try:
+        # 좌석 배치표 (프로세스당 한 번 읽어 둔 캐시 사용)
+        template = load_template(path)
+    except TEMPLATE_ERRORS as e:
+        log.warning("좌석 배치표(%s)를 읽을 수 없어 결과 파일에 넣지 않음: %r", path, e)
+        return
+    
+    # 시트 복사 (서식 포함)
+    ws2 = wb.create_sheet(title=title)
+    
+    # 페이지 설정 복사
+    if template.page_setup:
+        orientation, paper_size, fit_to_height, fit_to_width = template.page_setup
+        ws2.page_setup.orientation = orientation
+        ws2.page_setup.paperSize = paper_size
+        ws2.page_setup.fitToHeight = fit_to_height
+        ws2.page_setup.fitToWidth = fit_to_width
+        ws2.page_setup.fitToPage = True  # 용지에 맞추기 설정 켜기
+    
+    # 페이지 여백 복사
+    if template.page_margins:
+        ws2.page_margins = copy(template.page_margins)
+    
+    # 인쇄 설정 복사
+    ws2.print_options.horizontalCentered, ws2.print_options.verticalCentered = template.print_options
+    
+    # 인쇄 영역 복사
+    ws2.print_area = template.print_area
+
+    # 셀 복사 (값과 서식 모두)
+    for row_idx, col_idx, value, style in template.cells:
+        new_cell = ws2.cell(row=row_idx, column=col_idx, value=value)
+        if style:
+            font, border, fill, alignment, number_format, protection = style
+            if font:
+                new_cell.font = font
+            if border:
+                new_cell.border = border
+            if fill:
+                new_cell.fill = fill
+            if alignment:
+                new_cell.alignment = alignment
+            new_cell.number_format = number_format
+            if protection:
+                new_cell.protection = protection
+    
+    # 좌석 칸에 이름 채우기
+    for ref, value in (cell_values or {}).items():
+        ws2[ref].value = value
+    
+    # 병합된 셀 복사
+    for merged_range in template.merged_ranges:
+        ws2.merge_cells(merged_range)
+    
+    # 행 높이 복사 - 원본 그대로
+    for row_idx, height in template.row_heights.items():
+        ws2.row_dimensions[row_idx].height = height
+    
+    # 모든 열에 대해 너비 설정
+    for col_idx in range(1, template.max_column + 1):
+        col_letter = get_column_letter(col_idx)
+        src_width, src_hidden = template.column_dimensions.get(col_letter, (None, None))
+        
+        width = _column_width(path)(col_letter, src_width)
+        if width is not None:
+            ws2.column_dimensions[col_letter].width = width
+        
+        # 숨김 상태 복사
+        if col_letter in template.column_dimensions:
+            ws2.column_dimensions[col_letter].hidden = src_hidden
+    
+    # 이미지 복사 (있는 경우)
+    for data, anchor in template.images:
+        try:
+            img_copy = Image(io.BytesIO(data))
+            img_copy.anchor = copy(anchor)
+            ws2.add_image(img_copy)
+        except (OSError, ValueError) as e:
+            log.warning("좌석 배치표(%s)의 그림을 복사할 수 없어 건너뜀: %r", path, e)
@@ -0,0 +1,67 @@
+# 구역별 누적 노출 횟수
+# 사람별로 앞/가운데/뒤/의자 구역에 앉은 횟수를 세어 두고, 좌석을 뽑을 때
+# 앞쪽에 많이 앉은 사람은 뒤로, 뒤쪽이나 의자에 많이 앉은 사람은 앞으로 오도록 가중치를 줌
+# (배정 규칙과 좌석 집합은 그대로, assignment.assign_seats의 weights 참고)
+# 횟수는 제비뽑기마다 사람당 O(1)로 더함 (기록 저장소: history.DrawHistory, 시뮬레이션: rotation)
+from .assignment import is_chair
+
+# 구역 (횟수 순서, 기록 저장소의 열 이름)
+ZONES = ('front', 'middle', 'back', 'chair')
+ZONE_LABELS = {'front': "앞", 'middle': "가운데", 'back': "뒤", 'chair': "의자"}
+
+
+# 일반 좌석 구역 경계 (앞 구역 마지막 번호, 가운데 구역 마지막 번호)
+# config의 exposure_zones가 없으면 일반 좌석을 3등분
+def zone_bounds(config):
+    if config.get('exposure_zones'):
+        return tuple(config['exposure_zones'])
+    seat_count = config['seat_count']
+    return (-(-seat_count // 3), -(-seat_count * 2 // 3))
+
+
+# 좌석의 구역 번호 (ZONES 순서)
+def seat_zone(seat, bounds):
+    if is_chair(seat):
+        return 3
+    front_last, middle_last = bounds
+    if seat <= front_last:
+        return 0
+    if seat <= middle_last:
+        return 1
+    return 2
+
+
+# 횟수를 찾을 때 쓰는 사람 키 (그룹이 없으면 빈 문자열)
+def person_key(person):
+    return (person['이름'], person['그룹'] or '')
+
+
+# 누적 횟수 (front, middle, back, chair)로 가중치 계산
+# (1 + 뒤 + 의자) / (1 + 앞): 앞에 앉은 횟수에 비례해 뒤로, 뒤/의자 횟수에 비례해 앞으로
+# 기록이 없거나 앞과 뒤 횟수가 같으면 1 (가중치가 모두 같으면 균등한 추첨과 같음)
+def exposure_weight(counts):
+    front, middle, back, chair = counts
+    return (1 + back + chair) / (1 + front)
+
+
+# 사람 목록 순서대로 가중치 목록 (exposure: {person_key: 횟수})
+def exposure_weights(persons, exposure):
+    return [exposure_weight(exposure.get(person_key(p), (0, 0, 0, 0))) for p in persons]
+
+
+# 메모리 안의 누적 횟수 (시뮬레이터용, 기록 저장소와 같은 방식으로 셈)
+class ExposureCounter:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = {}
+
+    # 제비뽑기 한 번의 결과 반영 (사람당 O(1))
+    def update(self, persons, seats):
+        bounds = self.bounds
+        counts = self.counts
+        for person, seat in zip(persons, seats):
+            key = person_key(person)
+            row = counts.get(key)
+            if row is None:
+                row = counts[key] = [0, 0, 0, 0]
+            row[seat_zone(seat, bounds)] += 1
@@ -0,0 +1,106 @@
+from collections import Counter, deque, namedtuple
+
+# 배정 불가능한 제약 (인원 demand명이 좌석 범위 seats 안 빈 좌석 supply개를 두고 경쟁)
+Shortfall = namedtuple('Shortfall', ['labels', 'demand', 'supply', 'seats'])
+
+
+# 좌석을 뽑기 전에 모든 사람이 자기 규칙 안에서 좌석을 받을 수 있는지 확인
+# 같은 규칙을 가진 사람을 하나로 묶고, 좌석은 규칙 범위의 경계로 잘라 구간으로 묶은 뒤
+# (규칙 → 구간) 이분 그래프에서 최대 유량을 구함 (홀의 조건)
+# 사람/좌석 수와 무관하게 그래프 크기는 규칙 수에만 비례하므로 전체 비용은 O(n)
+# 모두 배정할 수 있으면 None, 아니면 수요가 공급을 넘는 규칙 묶음을 Shortfall로 반환
+def check_feasibility(rules, seat_pool):
+    demand = Counter(rules)
+    classes = list(demand)
+    if not classes:
+        return None
+
+    # 규칙별 위치 범위
+    class_spans = [
+        [seat_pool.span(r.lo, r.hi) for r in rule.ranges]
+        for rule in classes
+    ]
+
+    # 모든 범위 경계로 좌석을 구간으로 나눔
+    cuts = sorted({p for spans in class_spans for span in spans for p in span})
+    segments = [(a, b) for a, b in zip(cuts, cuts[1:]) if a < b]
+
+    # 노드: 0=출발, 1..k=규칙, k+1..k+m=구간, k+m+1=도착
+    k, m = len(classes), len(segments)
+    source, sink = 0, k + m + 1
+    graph = [dict() for _ in range(k + m + 2)]
+
+    def add_edge(u, v, cap):
+        graph[u][v] = graph[u].get(v, 0) + cap
+        graph[v].setdefault(u, 0)
+
+    total_demand = 0
+    for ci, rule in enumerate(classes):
+        add_edge(source, 1 + ci, demand[rule])
+        total_demand += demand[rule]
+        for si, (a, b) in enumerate(segments):
+            if any(start <= a and b <= stop for start, stop in class_spans[ci]):
+                add_edge(1 + ci, 1 + k + si, total_demand + len(seat_pool))
+    for si, (a, b) in enumerate(segments):
+        add_edge(1 + k + si, sink, seat_pool.count_span(a, b))
+
+    # 최대 유량 (에드먼즈-카프, 그래프가 작아 충분히 빠름)
+    flow = 0
+    while True:
+        parent = {source: None}
+        queue = deque([source])
+        while queue and sink not in parent:
+            u = queue.popleft()
+            for v, cap in graph[u].items():
+                if cap > 0 and v not in parent:
+                    parent[v] = u
+                    queue.append(v)
+        if sink not in parent:
+            break
+        path = []
+        v = sink
+        while parent[v] is not None:
+            path.append((parent[v], v))
+            v = parent[v]
+        pushed = min(graph[u][v] for u, v in path)
+        for u, v in path:
+            graph[u][v] -= pushed
+            graph[v][u] += pushed
+        flow += pushed
+
+    if flow == total_demand:
+        return None
+
+    # 최소 컷에서 출발 쪽에 남은 규칙 묶음이 홀의 조건을 어기는 집합
+    reachable = set(parent)
+    short_classes = [ci for ci in range(k) if 1 + ci in reachable]
+    short_segments = [si for si in range(m) if 1 + k + si in reachable]
+
+    return Shortfall(
+        labels=sorted({classes[ci].label for ci in short_classes}),
+        demand=sum(demand[classes[ci]] for ci in short_classes),
+        supply=sum(seat_pool.count_span(*segments[si]) for si in short_segments),
+        seats=_describe_segments([segments[si] for si in short_segments], seat_pool.seats),
+    )
+
+
+# 구간 목록을 "50~225, 의자1~의자49" 같은 문자열로 (일반 좌석과 의자는 나눠서 표시)
+def _describe_segments(segments, seats):
+    merged = []
+    for a, b in sorted(segments):
+        if merged and merged[-1][1] == a and type(seats[a - 1]) is type(seats[a]):
+            merged[-1][1] = b
+        else:
+            merged.append([a, b])
+    return ", ".join(
+        f"{seats[a]}" if b - a == 1 else f"{seats[a]}~{seats[b - 1]}"
+        for a, b in merged
+    )
+
+
+# 사용자에게 보여줄 메시지
+def describe_shortfall(shortfall):
+    return (
+        f"좌석 제약을 모두 만족할 수 없습니다: {', '.join(shortfall.labels)} "
+        f"{shortfall.demand}명이 배정 가능한 좌석({shortfall.seats}) {shortfall.supply}개보다 많습니다."
+    )
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+from datetime import datetime
+
+from .assignment import is_chair
+from .roster import PREV_FRONT_RANGE
+from .exposure import ZONES, seat_zone, zone_bounds
+
+# 제비뽑기 기록 저장소 (SQLite)
+# 끝난 제비뽑기마다 사람별 좌석을 남겨 두고, 지난번 앞쪽 배치자를
+# 명단 두 번째 시트 대신 최근 N회 기록에서 한 번의 조회로 찾음
+# 앱(설정)마다 따로 기록하며, 같은 날짜를 다시 뽑으면 그날 기록을 새 결과로 바꿈
+# 사람별 구역(앞/가운데/뒤/의자) 누적 횟수도 기록할 때마다 사람당 한 행씩 더해 둠 (exposure 참고)
+
+# 앱 디렉토리의 기본 기록 파일
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "draw_history.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS draws (
+    id INTEGER PRIMARY KEY,
+    preset TEXT NOT NULL,
+    draw_date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (preset, draw_date)
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    draw_id INTEGER NOT NULL REFERENCES draws(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    group_name TEXT,
+    draw_date TEXT NOT NULL,
+    seat TEXT NOT NULL,
+    seat_number INTEGER
+);
+-- 사람별 기록 조회 (이름, 그룹, 날짜)
+CREATE INDEX IF NOT EXISTS assignments_person ON assignments (name, group_name, draw_date);
+-- 최근 N회 안에서 좌석 번호 범위 조회
+CREATE INDEX IF NOT EXISTS assignments_draw_seat ON assignments (draw_id, seat_number);
+-- 사람별 구역 누적 횟수 (그룹이 없으면 빈 문자열)
+CREATE TABLE IF NOT EXISTS exposure (
+    preset TEXT NOT NULL,
+    name TEXT NOT NULL,
+    group_name TEXT NOT NULL DEFAULT '',
+    front INTEGER NOT NULL DEFAULT 0,
+    middle INTEGER NOT NULL DEFAULT 0,
+    back INTEGER NOT NULL DEFAULT 0,
+    chair INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (preset, name, group_name)
+);
+"""
+
+
+# 날짜(datetime, date, 'YYYY-MM-DD')를 기록용 문자열로
+def _date_key(value):
+    if isinstance(value, str):
+        return value
+    return value.strftime('%Y-%m-%d')
+
+
+# preset: 기록을 나눠 두는 이름 (규칙 이름, rules.AssignmentPlan.name)
+# 연결은 호출마다 새로 열어서 Streamlit의 여러 스레드에서 같은 객체를 써도 됨
+class DrawHistory:
+    def __init__(self, path=DEFAULT_HISTORY_PATH, preset='lottery_app'):
+        self.path = path
+        self.preset = preset
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    # 끝난 제비뽑기 기록 (records: {'이름', '그룹', '당첨번호'} 목록), 기록 번호 반환
+    # config: 뽑을 때 쓴 배정 설정 (구역 경계 계산)
+    # 같은 날짜 기록을 바꾸면 이전 기록만큼 누적 횟수를 빼고 새 결과를 더함
+    def record_draw(self, records, draw_date, config):
+        date_key = _date_key(draw_date)
+        bounds = zone_bounds(config)
+        rows = [
+            (record['이름'], record.get('그룹'), date_key, str(record['당첨번호']),
+             None if is_chair(record['당첨번호']) else int(record['당첨번호']))
+            for record in records
+        ]
+        conn = self._connect()
+        try:
+            with conn:
+                replaced = conn.execute(
+                    "SELECT a.name, a.group_name, a.seat FROM assignments a JOIN draws d ON d.id = a.draw_id "
+                    "WHERE d.preset = ? AND d.draw_date = ?",
+                    (self.preset, date_key)
+                ).fetchall()
+                self._add_exposure(conn, [(name, group, int(seat) if seat.isdigit() else seat)
+                                          for name, group, seat in replaced], bounds, -1)
+                conn.execute("DELETE FROM draws WHERE preset = ? AND draw_date = ?", (self.preset, date_key))
+                draw_id = conn.execute(
+                    "INSERT INTO draws (preset, draw_date, created_at) VALUES (?, ?, ?)",
+                    (self.preset, date_key, datetime.now().isoformat(timespec='seconds'))
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO assignments (draw_id, name, group_name, draw_date, seat, seat_number) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(draw_id,) + row for row in rows]
+                )
+                self._add_exposure(conn, [(record['이름'], record.get('그룹'), record['당첨번호'])
+                                          for record in records], bounds, 1)
+            return draw_id
+        finally:
+            conn.close()
+
+    # (이름, 그룹, 좌석) 목록의 구역 횟수에 delta를 더함 (구역별로 한 번의 executemany, 사람당 O(1))
+    def _add_exposure(self, conn, seated, bounds, delta):
+        by_zone = [[] for _ in ZONES]
+        for name, group, seat in seated:
+            by_zone[seat_zone(seat, bounds)].append((self.preset, name, group or '', delta))
+        for zone, rows in zip(ZONES, by_zone):
+            if rows:
+                conn.executemany(
+                    f"INSERT INTO exposure (preset, name, group_name, {zone}) VALUES (?, ?, ?, ?) "
+                    f"ON CONFLICT (preset, name, group_name) DO UPDATE SET {zone} = {zone} + excluded.{zone}",
+                    rows
+                )
+
+    # 사람별 구역 누적 횟수 {(이름, 그룹): (front, middle, back, chair)} (exposure.person_key와 같은 키)
+    # before: 이 날짜 이전 기록만 셈 (같은 날짜를 다시 뽑거나 지난 제비뽑기를 다시 실행할 때 뽑을 때와 같은 횟수)
+    #         before 이후 기록이 없으면 누적 횟수 표를 그대로 쓰고, 있으면 좌석 기록에서 다시 셈 (config로 구역 경계 계산)
+    def exposure(self, before=None, config=None):
+        conn = self._connect()
+        try:
+            if before is not None and conn.execute(
+                "SELECT 1 FROM draws WHERE preset = ? AND draw_date >= ? LIMIT 1",
+                (self.preset, _date_key(before))
+            ).fetchone():
+                return self._exposure_before(conn, _date_key(before), zone_bounds(config))
+            rows = conn.execute(
+                "SELECT name, group_name, front, middle, back, chair FROM exposure WHERE preset = ?",
+                (self.preset,)
+            )
+            return {(name, group): tuple(counts) for name, group, *counts in rows}
+        finally:
+            conn.close()
+
+    def _exposure_before(self, conn, before_key, bounds):
+        counts = {}
+        rows = conn.execute(
+            "SELECT a.name, a.group_name, a.seat FROM assignments a JOIN draws d ON d.id = a.draw_id "
+            "WHERE d.preset = ? AND d.draw_date < ?",
+            (self.preset, before_key)
+        )
+        for name, group, seat in rows:
+            row = counts.setdefault((name, group or ''), [0] * len(ZONES))
+            row[seat_zone(int(seat) if seat.isdigit() else seat, bounds)] += 1
+        return {key: tuple(row) for key, row in counts.items()}
+
+    # before 날짜 이전 최근 last_n회 안에 앞쪽(1~21번) 좌석에 앉았던 이름
+    # 최근 기록 번호를 고른 뒤 (기록 번호, 좌석 번호) 인덱스로 앞쪽 좌석만 읽는 한 번의 조회
+    # 이전 기록이 하나도 없으면 None (명단 두 번째 시트로 대신할 수 있도록)
+    def prev_front_names(self, before=None, last_n=1, front=PREV_FRONT_RANGE):
+        before_key = _date_key(before) if before is not None else '9999-12-31'
+        lo, hi = front
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT d.id, a.name FROM "
+                "(SELECT id FROM draws WHERE preset = ? AND draw_date < ? ORDER BY draw_date DESC LIMIT ?) d "
+                "LEFT JOIN assignments a ON a.draw_id = d.id AND a.seat_number BETWEEN ? AND ?",
+                (self.preset, before_key, last_n, lo, hi)
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return None
+        return {name for draw_id, name in rows if name is not None}
+
+    # 한 사람의 최근 좌석 기록 [(날짜, 좌석)] (최신순, group이 None이면 동명이인 모두)
+    def person_history(self, name, group=None, limit=10):
+        conn = self._connect()
+        try:
+            if group is None:
+                rows = conn.execute(
+                    "SELECT a.draw_date, a.seat FROM assignments a JOIN draws d ON d.id = a.draw_id "
+                    "WHERE a.name = ? AND d.preset = ? ORDER BY a.draw_date DESC LIMIT ?",
+                    (name, self.preset, limit)
+                )
+            else:
+                rows = conn.execute(
+                    "SELECT a.draw_date, a.seat FROM assignments a JOIN draws d ON d.id = a.draw_id "
+                    "WHERE a.name = ? AND a.group_name = ? AND d.preset = ? ORDER BY a.draw_date DESC LIMIT ?",
+                    (name, group, self.preset, limit)
+                )
+            return [(draw_date, int(seat) if seat.isdigit() else seat) for draw_date, seat in rows]
+        finally:
+            conn.close()
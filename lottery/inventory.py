@@ -0,0 +1,139 @@
+import bisect
+import os
+import re
+from collections import namedtuple
+from types import MappingProxyType
+
+from openpyxl.utils import column_index_from_string
+
+from .assignment import chair_label, is_chair
+from .template import load_seat_index
+
+# 여러 장소(본당, 별관, 보조 장소 등)의 좌석 목록
+# 장소마다 좌석 배치표 파일에서 좌석 칸을 읽어(template.load_seat_index) 한 줄로 이어 붙임
+# 좌석 ID는 기존 규칙, 결과 파일, 기록이 그대로 쓰이도록 전체에서 이어지는 번호:
+#   일반 좌석은 첫 장소 1..n1, 다음 장소 n1+1..n1+n2, ... (첫 장소는 배치표에 적힌 번호와 같음)
+#   의자도 같은 순서로 의자1, 의자2, ...
+# 좌석 순서(SeatPool 위치)는 모든 장소의 일반 좌석 다음에 모든 장소의 의자라서,
+# 규칙의 좌석 번호 범위(예: 20~끝)는 장소를 넘어 그대로 적용됨
+# 구역: 배치표에서 빈 열로 나뉜 좌석 열 묶음 (왼쪽부터 1구역, 2구역, ...), 의자는 '의자' 구역
+
+# 한 좌석: 장소 이름, 구역, 좌석 ID (전체 번호 또는 '의자N'), 속성
+# attributes: {'number': 배치표에 적힌 번호, 'ref': 배치표 셀 주소, 'row': 행 번호, 'column': 열 문자, 'chair': 의자 여부}
+Seat = namedtuple('Seat', ['venue', 'zone', 'seat_id', 'attributes'])
+
+CHAIR_ZONE = "의자"
+
+
+# 좌석 목록과 장소/구역별 색인
+# 장소/구역별 좌석 위치를 정렬된 목록으로 두어 구역 조회는 O(1), 번호 범위 조회는 이분 탐색 O(log n + k)
+class SeatInventory:
+    def __init__(self, seats, charts=None):
+        self.seats = tuple(seats)
+        self.ids = tuple(seat.seat_id for seat in self.seats)
+        self.charts = MappingProxyType(dict(charts or {}))
+        self._pos = {seat_id: i for i, seat_id in enumerate(self.ids)}
+        if len(self._pos) != len(self.ids):
+            raise ValueError("좌석 ID가 중복되었습니다.")
+
+        # (장소, 구역) → 좌석 위치 목록, None은 전체
+        index = {}
+        for i, seat in enumerate(self.seats):
+            for key in ((seat.venue, seat.zone), (seat.venue, None), (None, seat.zone), (None, None)):
+                index.setdefault(key, []).append(i)
+        self._index = index
+        self.venues = tuple(dict.fromkeys(seat.venue for seat in self.seats))
+        self.chair_count = len(index.get((None, CHAIR_ZONE), ()))
+        self.seat_count = len(self.seats) - self.chair_count
+
+    def __len__(self):
+        return len(self.seats)
+
+    def __contains__(self, seat_id):
+        return seat_id in self._pos
+
+    # 좌석 ID → Seat
+    def __getitem__(self, seat_id):
+        return self.seats[self._pos[seat_id]]
+
+    def position(self, seat_id):
+        return self._pos[seat_id]
+
+    # 장소의 구역 이름 (1구역, 2구역, ..., 의자)
+    def zones(self, venue):
+        zones = {self.seats[i].zone for i in self._index.get((venue, None), ())}
+        return sorted(zones, key=lambda zone: (zone == CHAIR_ZONE, int(zone[:-2]) if zone != CHAIR_ZONE else 0))
+
+    # 장소, 구역, 좌석 ID 범위(lo, hi 포함, 좌석 순서 기준)로 좌석 조회 (생략하면 전체)
+    def find(self, venue=None, zone=None, lo=None, hi=None):
+        positions = self._index.get((venue, zone), [])
+        start = 0 if lo is None else bisect.bisect_left(positions, self._pos[lo])
+        stop = len(positions) if hi is None else bisect.bisect_right(positions, self._pos[hi])
+        return [self.seats[i] for i in positions[start:stop]]
+
+    def count(self, venue=None, zone=None, lo=None, hi=None):
+        positions = self._index.get((venue, zone), [])
+        start = 0 if lo is None else bisect.bisect_left(positions, self._pos[lo])
+        stop = len(positions) if hi is None else bisect.bisect_right(positions, self._pos[hi])
+        return max(stop - start, 0)
+
+    # 결과에 표시할 좌석 이름 ('별관 12', '별관 의자3')
+    def label(self, seat_id):
+        seat = self[seat_id]
+        number = seat.attributes['number']
+        return f"{seat.venue} {chair_label(number) if seat.attributes['chair'] else number}"
+
+
+# 배치표 좌석 칸의 구역: 좌석이 있는 열을 빈 열 기준으로 묶어 왼쪽부터 번호 (의자만 있는 묶음은 제외)
+def _column_zones(seat_index):
+    columns = {}
+    for seat, (ref, number) in seat_index.items():
+        column = re.match(r'[A-Z]+', ref).group()
+        columns.setdefault(column_index_from_string(column), set()).add(is_chair(seat))
+
+    zones = {}
+    zone = 0
+    previous = None
+    new_block = True
+    for col in sorted(columns):
+        if previous is not None and col != previous + 1:
+            new_block = True
+        if new_block and False in columns[col]:
+            zone += 1
+            new_block = False
+        zones[col] = f"{max(zone, 1)}구역"
+        previous = col
+    return zones
+
+
+# 배치표 하나의 (일반 좌석, 의자) 목록, 각각 배치표 번호순 [(번호, 구역, 속성)]
+def _chart_seats(seat_index):
+    zones = _column_zones(seat_index)
+    regular, chairs = [], []
+    for seat, (ref, number) in seat_index.items():
+        column, row = re.match(r'([A-Z]+)(\d+)', ref).groups()
+        chair = is_chair(seat)
+        attributes = MappingProxyType(
+            {'number': number, 'ref': ref, 'row': int(row), 'column': column, 'chair': chair})
+        zone = CHAIR_ZONE if chair else zones[column_index_from_string(column)]
+        (chairs if chair else regular).append((number, zone, attributes))
+    return sorted(regular, key=lambda s: s[0]), sorted(chairs, key=lambda s: s[0])
+
+
+# 장소 목록 [(이름, 배치표 경로)]로 좌석 목록 생성 (상대 경로는 base_dir 기준)
+# 배치표에서 좌석을 찾지 못하면 ValueError
+def load_inventory(venues, base_dir):
+    charts = {}
+    regular, chairs = [], []
+    for name, chart in venues:
+        path = chart if os.path.isabs(chart) else os.path.join(base_dir, chart)
+        venue_regular, venue_chairs = _chart_seats(load_seat_index(path))
+        if not venue_regular and not venue_chairs:
+            raise ValueError(f"{name}: 좌석 배치표 {chart}에서 좌석을 찾을 수 없습니다.")
+        charts[name] = path
+        regular += [(name, zone, attributes) for _, zone, attributes in venue_regular]
+        chairs += [(name, zone, attributes) for _, zone, attributes in venue_chairs]
+
+    seats = [Seat(name, zone, i, attributes) for i, (name, zone, attributes) in enumerate(regular, 1)]
+    seats += [Seat(name, zone, chair_label(i), attributes) for i, (name, zone, attributes) in enumerate(chairs, 1)]
+    return SeatInventory(seats, charts)
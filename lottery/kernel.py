@@ -0,0 +1,127 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .assignment import SeatAssignmentError
+
+# NumPy 배정 커널
+# 사람과 좌석을 정수 위치 배열로 다루고, 규칙(build_rules)을 좌석별 우선순위 배열로 바꿔
+# 같은 규칙 묶음은 좌석 순열 한 번과 안정 정렬 한 번으로 한꺼번에 배정
+# 결과는 사람별 좌석 위치와 무작위 키 배열 (사람마다 dict를 만들지 않음)
+# 공정성 시뮬레이터(simulate)도 같은 단계(compile_steps)로 여러 번을 한꺼번에 뽑음
+
+# 배정 단계
+# kind='block': 같은 규칙을 가진 사람 묶음 (한 번의 정렬로 한꺼번에 배정)
+# kind='each': 같은 순위에 규칙이 다른 사람들 (무작위 키 순서로 한 명씩 배정)
+# persons: 사람 위치 배열, base[s]는 좌석 s의 우선순위(몇 번째 범위인지, 'first' 범위는 좌석 순서까지 포함),
+# noise[s]는 무작위로 뽑는 범위의 좌석이면 1 ('each'는 사람마다 한 행)
+# classes: 'each' 단계에서 규칙이 같은 행 번호 배열 목록 (가중치 재배치용, 'block'은 None)
+Step = namedtuple('Step', ['kind', 'persons', 'base', 'noise', 'classes'])
+
+# 커널 결과: 사람별 좌석 위치 (seat_pool.seats 기준), 사람별 무작위 키 (같은 순위 안의 배정 순서)
+DrawColumns = namedtuple('DrawColumns', ['seat', 'key'])
+
+
+# 규칙 하나를 좌석별 우선순위 배열로 변환
+def _rule_arrays(rule, seat_pool):
+    n_seats = len(seat_pool.seats)
+    base = np.full(n_seats, np.inf)
+    noise = np.zeros(n_seats)
+    for priority, seat_range in enumerate(rule.ranges):
+        start, stop = seat_pool.span(seat_range.lo, seat_range.hi)
+        unset = np.isinf(base[start:stop])
+        if seat_range.pick == 'first':
+            offsets = (np.arange(start, stop) - start) / max(stop - start, 1)
+            base[start:stop][unset] = priority + offsets[unset]
+        else:
+            base[start:stop][unset] = priority
+            noise[start:stop][unset] = 1.0
+    return base, noise
+
+
+# 사람별 규칙을 순위별 배정 단계로 변환
+# 같은 순위의 사람들은 assign_seats처럼 순서가 무작위로 섞이므로,
+# 규칙이 하나면 한 묶음으로, 여러 개면 한 명씩 배정하는 단계로 만듦
+def compile_steps(rules, seat_pool):
+    rule_arrays = {}
+    by_rank = {}
+    for i, rule in enumerate(rules):
+        by_rank.setdefault(rule.rank, []).append(i)
+        if rule not in rule_arrays:
+            rule_arrays[rule] = _rule_arrays(rule, seat_pool)
+
+    steps = []
+    for rank in sorted(by_rank):
+        members = by_rank[rank]
+        distinct = {rules[i] for i in members}
+        if len(distinct) == 1:
+            base, noise = rule_arrays[rules[members[0]]]
+            steps.append(Step('block', np.array(members), base, noise, None))
+        else:
+            base = np.stack([rule_arrays[rules[i]][0] for i in members])
+            noise = np.stack([rule_arrays[rules[i]][1] for i in members])
+            rows = {}
+            for row, i in enumerate(members):
+                rows.setdefault(rules[i], []).append(row)
+            classes = [np.array(r) for r in rows.values() if len(r) > 1]
+            steps.append(Step('each', np.array(members), base, noise, classes))
+    return steps
+
+
+# 묶음에 줄 좌석 위치 (우선순위 순, 같은 우선순위 안에서는 무작위)
+# 빈 후보 좌석을 한 번 섞은 뒤 우선순위로 안정 정렬하면 같은 우선순위 안의 순서는 섞인 그대로 남음
+def _block_seats(step, free, rng):
+    candidates = np.flatnonzero(free & np.isfinite(step.base))
+    count = len(step.persons)
+    if len(candidates) < count:
+        raise SeatAssignmentError(f"{count}명을 배정할 빈 좌석이 {len(candidates)}개뿐입니다.")
+    shuffled = rng.permutation(candidates)
+    return shuffled[np.argsort(step.base[shuffled], kind='stable')[:count]]
+
+
+# 가중 무작위 순서 (Efraimidis–Spirakis 키 log(u)/w 내림차순, assignment._weighted_reorder와 같은 방식)
+def _weighted_order(keys, weights):
+    return np.argsort(-(np.log1p(-keys) / weights), kind='stable')
+
+
+# 사람 n_persons명을 steps대로 배정 (seat_pool에서 이미 배정된 좌석은 쓰지 않고, seat_pool은 바꾸지 않음)
+# rng: NumPy Generator, weights: 사람별 가중치 (없으면 균등)
+# 무작위 키를 사람마다 하나씩 뽑아 같은 순위 안의 배정 순서로 씀
+# 가중치가 있으면 묶음 단계는 이 키로 가중 순서를 정하고 (배정 순서와 무관한 단계),
+# 한 명씩 뽑는 단계는 규칙별로 새 균등 난수를 뽑아 가중 순서를 정함
+def draw_columns(steps, n_persons, seat_pool, rng, weights=None):
+    free = np.frombuffer(seat_pool.free_flags(), dtype=np.uint8).astype(bool)
+    seat_of = np.full(n_persons, -1, dtype=np.int64)
+    keys = rng.random(n_persons)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+
+    for step in steps:
+        members = step.persons
+        if step.kind == 'block':
+            chosen = _block_seats(step, free, rng)
+            if weights is None:
+                seat_of[members[np.argsort(keys[members], kind='stable')]] = chosen
+            else:
+                seat_of[members[_weighted_order(keys[members], weights[members])]] = np.sort(chosen)
+            free[chosen] = False
+            continue
+
+        for row in np.argsort(keys[members], kind='stable'):
+            base = step.base[row]
+            candidates = np.flatnonzero(free & np.isfinite(base))
+            if len(candidates) == 0:
+                raise SeatAssignmentError("배정할 수 있는 빈 좌석이 없습니다.")
+            tier = base[candidates]
+            best = candidates[tier == tier.min()]
+            seat = best[rng.integers(len(best))] if len(best) > 1 else best[0]
+            seat_of[members[row]] = seat
+            free[seat] = False
+        if weights is not None:
+            # 가중 순서는 배정 순서(keys)와 따로 새 균등 난수로 정함 (파이썬 경로 _weighted_reorder와 같은 분포)
+            for rows in step.classes:
+                people = members[rows]
+                order = _weighted_order(rng.random(len(people)), weights[people])
+                seat_of[people[order]] = np.sort(seat_of[people])
+
+    return DrawColumns(seat_of, keys)
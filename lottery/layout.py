@@ -0,0 +1,124 @@
+from collections import namedtuple
+
+from .styles import RESULT_STYLES, border_styles
+
+# 결과 시트 배치 계산
+# 셀마다 값, 스타일, 최종 테두리를 미리 정해 행 순서대로 내보내므로
+# 렌더러는 셀을 한 번씩만 쓰면 됨 (일반 워크북, 쓰기 전용 워크북 모두 사용)
+
+# 섹션별 행 수와 열 수
+ROWS_PER_SECTION = 30
+COLS_PER_SECTION = 3
+
+SECTION_HEADERS = ["이 름", "당첨번호", "이 름", "당첨번호", "이 름", "당첨번호"]
+SECTION_WIDTH = len(SECTION_HEADERS)
+
+# 열 너비 (홀수 열: 이름, 짝수 열: 당첨번호)
+RESULT_COLUMN_WIDTHS = {'A': 15, 'B': 12, 'C': 15, 'D': 12, 'E': 15, 'F': 12}
+BY_NUMBER_COLUMN_WIDTHS = {'A': 12, 'B': 18, 'C': 18}
+
+# 행 높이
+TITLE_ROW_HEIGHT = 32
+DATE_ROW_HEIGHT = 24
+HEADER_ROW_HEIGHT = 20
+DATA_ROW_HEIGHT = 22.80
+
+# 한 셀: 열 번호, 값, 스타일 이름(없으면 None), 테두리 네 변 (left, right, top, bottom)
+# border가 None이면 스타일의 테두리를 그대로 사용
+LayoutCell = namedtuple('LayoutCell', ['column', 'value', 'style', 'border'])
+
+# 한 행: 행 번호, 높이(없으면 None), 셀 목록(열 순서), 병합 범위 [(시작 열, 끝 열)]
+LayoutRow = namedtuple('LayoutRow', ['row', 'height', 'cells', 'merges'])
+
+# 스타일별 테두리 네 변
+_STYLE_SIDES = {
+    name: border_styles(border) if border else (None, None, None, None)
+    for name, (font, border, fill, alignment) in RESULT_STYLES.items()
+}
+
+
+# 당첨번호 정렬 키 (일반 좌석은 번호순, 그 다음 의자 번호순, 기타 형식은 맨 뒤)
+# 좌석이 1000개를 넘는 여러 장소 규칙에서도 의자가 일반 좌석 사이에 끼지 않도록 (구분, 번호) 순서쌍
+def number_sort_key(item):
+    number = item['당첨번호']
+    if isinstance(number, int) or str(number).isdigit():
+        return (0, int(number))
+    elif isinstance(number, str) and number.startswith('의자'):
+        try:
+            # '의자1' -> (1, 1), '의자2' -> (1, 2) 등으로 변환
+            return (1, int(number.replace('의자', '')))
+        except:
+            return (2, 0)  # 변환 실패 시 맨 뒤로
+    else:
+        return (2, 0)  # 기타 형식은 맨 뒤로
+
+
+# 섹션 바깥 테두리: 섹션 사각형의 가장자리 셀은 바깥쪽 변을 굵은 선으로 (모서리는 두 변)
+# 가장자리에 값이 없는 셀도 테두리만 있는 빈 셀로 채움
+def _with_perimeter(cells, first, last):
+    by_column = {cell.column: cell for cell in cells}
+    columns = range(1, SECTION_WIDTH + 1) if first or last else (1, SECTION_WIDTH)
+    for c in columns:
+        cell = by_column.get(c) or LayoutCell(c, None, None, None)
+        left, right, top, bottom = _STYLE_SIDES.get(cell.style, (None, None, None, None))
+        by_column[c] = cell._replace(border=(
+            'medium' if c == 1 else left,
+            'medium' if c == SECTION_WIDTH else right,
+            'medium' if first else top,
+            'medium' if last else bottom,
+        ))
+    return [by_column[c] for c in sorted(by_column)]
+
+
+# "제비뽑기 결과" 시트: 이름순 records를 30행 × 3열 섹션으로 나눠 행 순서대로 반환
+def result_rows(records, today):
+    persons_per_section = ROWS_PER_SECTION * COLS_PER_SECTION
+    current_row = 1
+
+    for section_idx, start in enumerate(range(0, len(records), persons_per_section)):
+        section = records[start:start + persons_per_section]
+        data_rows = min(len(section), ROWS_PER_SECTION)
+
+        # 제목, 날짜, 헤더 행
+        rows = [
+            (TITLE_ROW_HEIGHT, [LayoutCell(1, f"제비뽑기 당첨 결과 {section_idx+1}", '결과 제목', None)],
+             [(1, SECTION_WIDTH)]),
+            (DATE_ROW_HEIGHT, [LayoutCell(1, f"날짜: {today}", '결과 굵게', None),
+                               LayoutCell(5, "(가나다순)", '결과 굵게', None)],
+             [(1, 2), (5, 6)]),
+            (HEADER_ROW_HEIGHT, [LayoutCell(i + 1, header, '결과 이름', None)
+                                 for i, header in enumerate(SECTION_HEADERS)], []),
+        ]
+
+        # 데이터 행: i번째 행에는 섹션 안 i, i+30, i+60번째 사람
+        for row_idx in range(data_rows):
+            cells = []
+            for col_set in range(COLS_PER_SECTION):
+                idx = col_set * ROWS_PER_SECTION + row_idx
+                if idx >= len(section):
+                    break
+                record = section[idx]
+                cells.append(LayoutCell(col_set * 2 + 1, record['이름'], '결과 이름', None))
+                cells.append(LayoutCell(col_set * 2 + 2, record['당첨번호'], '결과 번호', None))
+            rows.append((DATA_ROW_HEIGHT, cells, []))
+
+        for i, (height, cells, merges) in enumerate(rows):
+            cells = _with_perimeter(cells, first=(i == 0), last=(i == len(rows) - 1))
+            yield LayoutRow(current_row, height, cells, merges)
+            current_row += 1
+
+
+# "당첨번호순 결과" 시트: 헤더 다음에 당첨번호 순으로 정렬한 행
+# 장소가 여럿인 결과(records에 '좌석')면 C열에 장소별 좌석 이름
+def by_number_rows(records):
+    venue_seats = bool(records) and '좌석' in records[0]
+    header = [LayoutCell(1, "당첨번호", '번호순 머리글', None), LayoutCell(2, "이름", '번호순 머리글', None)]
+    if venue_seats:
+        header.append(LayoutCell(3, "장소 좌석", '번호순 머리글', None))
+    yield LayoutRow(1, None, header, [])
+    for idx, record in enumerate(sorted(records, key=number_sort_key), 2):  # 2부터 시작 (헤더 다음 행)
+        cells = [LayoutCell(1, record['당첨번호'], '번호순 번호', None),
+                 LayoutCell(2, record['이름'], '번호순 이름', None)]
+        if venue_seats:
+            cells.append(LayoutCell(3, record['좌석'], '번호순 이름', None))
+        yield LayoutRow(idx, DATA_ROW_HEIGHT, cells, [])
@@ -0,0 +1,111 @@
+import hashlib
+import random
+import secrets
+from collections import namedtuple
+
+# 제비뽑기 난수
+# 한 번의 제비뽑기는 씨앗(seed) 하나로 만든 생성기 하나만 씀 (배정 순서, 좌석, 랜덤값 모두)
+# 씨앗을 결과 파일에 남겨 두면 같은 명단과 규칙으로 결과를 그대로 다시 만들 수 있음 (draw.run_replay)
+# 생성기:
+#   'sha256'   기본값. 씨앗과 카운터의 SHA-256 해시를 이어 붙인 난수 (암호학적으로 안전),
+#              씨앗은 secrets로 만든 256비트
+#   'mt19937'  random.Random (메르센 트위스터). 빠르지만 안전하지 않으므로 직접 정한 씨앗으로
+#              시험하거나 시뮬레이션할 때 사용
+#   'pcg64'    NumPy Generator (PCG64). 배정을 NumPy 배열 연산(kernel)으로 해서 인원이 아주 많을 때 가장 빠름,
+#              안전하지 않으므로 씨앗은 secrets로 만든 256비트를 그대로 씀
+
+# 생성기 이름과 씨앗 (결과 파일에는 '생성기:씨앗' 문자열로 기록)
+DrawSeed = namedtuple('DrawSeed', ['generator', 'seed'])
+
+# 앱과 CLI의 기본 생성기: 파이썬 배정 경로 (NumPy 커널은 pcg64를 고를 때만 씀)
+DEFAULT_GENERATOR = 'sha256'
+
+# 결과 파일 문서 속성 (사용자 지정 속성) 이름: 다시 실행할 때 필요한 정보
+SEED_PROPERTY = "제비뽑기 난수"
+RULES_PROPERTY = "제비뽑기 규칙"
+DATE_PROPERTY = "제비뽑기 날짜"
+# 구역 누적 횟수 가중치를 준 결과에만 남김 (균등하게 뽑은 결과와 구분)
+WEIGHTING_PROPERTY = "제비뽑기 가중치"
+WEIGHTING_VALUE = "구역 누적 횟수"
+
+
+# SHA-256 카운터 모드 난수 생성기
+# random.Random의 getrandbits와 random만 바꾸므로 randrange, shuffle 등은 모두 이 바이트열을 씀
+class HashRandom(random.Random):
+    _BLOCK = hashlib.sha256().digest_size
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = secrets.token_hex(32)
+        self._key = hashlib.sha256(str(a).encode('utf-8')).digest()
+        self._counter = 0
+        self._buffer = b''
+        self._pos = 0
+
+    def _bytes(self, n):
+        while len(self._buffer) - self._pos < n:
+            block = hashlib.sha256(self._key + self._counter.to_bytes(8, 'big')).digest()
+            self._counter += 1
+            self._buffer = self._buffer[self._pos:] + block
+            self._pos = 0
+        data = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return data
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k == 0:
+            return 0
+        n = (k + 7) // 8
+        return int.from_bytes(self._bytes(n), 'big') >> (n * 8 - k)
+
+    # [0, 1) 범위 실수 (53비트, random.Random과 같은 방식)
+    def random(self):
+        return self.getrandbits(53) * (1.0 / (1 << 53))
+
+    def getstate(self):
+        return (self._key, self._counter, self._buffer, self._pos)
+
+    def setstate(self, state):
+        self._key, self._counter, self._buffer, self._pos = state
+
+
+# 씨앗 문자열의 SHA-256으로 만든 NumPy 생성기 (NumPy는 이 생성기를 쓸 때만 불러옴)
+def _numpy_generator(seed):
+    import numpy as np
+
+    return np.random.default_rng(int.from_bytes(hashlib.sha256(str(seed).encode('utf-8')).digest(), 'big'))
+
+
+GENERATORS = {
+    'sha256': HashRandom,
+    'mt19937': random.Random,
+    'pcg64': _numpy_generator,
+}
+
+# NumPy 배정 커널(kernel.draw_columns)로 배정하는 생성기
+# 기본값이 아니므로 명단이 아주 클 때 CLI의 --generator pcg64로 직접 골라야 함 (앱은 항상 기본 생성기)
+KERNEL_GENERATORS = {'pcg64'}
+
+
+# 새 씨앗 (secrets로 만든 256비트)
+def new_seed(generator=DEFAULT_GENERATOR):
+    return DrawSeed(generator, secrets.token_hex(32))
+
+
+# 씨앗으로 생성기 생성 (같은 씨앗이면 항상 같은 난수열)
+def make_rng(draw_seed):
+    return GENERATORS[draw_seed.generator](draw_seed.seed)
+
+
+def format_seed(draw_seed):
+    return f"{draw_seed.generator}:{draw_seed.seed}"
+
+
+# '생성기:씨앗' 문자열을 씨앗으로 (생성기 이름이 없으면 직접 정한 씨앗으로 보고 mt19937)
+def parse_seed(text):
+    generator, sep, seed = text.partition(':')
+    if sep and generator in GENERATORS:
+        return DrawSeed(generator, seed)
+    return DrawSeed('mt19937', text)
@@ -0,0 +1,289 @@
+import zipfile
+
+# 기관명으로 인정하는 접미사와 전체 이름 (남, 여, 청, 안나, 디모데, 사모회 등)
+GROUP_SUFFIXES = ('남', '여', '청', '안나')
+GROUP_NAMES = ('디모데', '사모회')
+
+# 이름으로 보지 않는 값
+NON_NAME_VALUES = ["기관", "합계", "명단", "NaT", "남", "여", "청", "안나", "디모데", "사모회"]
+
+# 엑셀 오류 값 (openpyxl.cell.cell.ERROR_CODES와 같음)
+ERROR_CODES = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
+
+# openpyxl은 파일을 처음 열 때, pandas와 numpy는 데이터프레임 경로(.xls 명단 등)에서만 불러옴
+# (앱 시작과 .xlsx 명단만 읽는 명령줄 실행에서 무거운 모듈을 불러오지 않음)
+
+
+# 첫 번째 열에서 기관명을 찾아 아래 행으로 채워 넣음 (벡터 연산)
+def _fill_groups(group_col):
+    import pandas as pd
+
+    groups = pd.Series(group_col, dtype=object)
+    is_str = groups.map(lambda v: isinstance(v, str))
+    stripped = groups.where(is_str).str.strip()
+    is_group = is_str & (stripped.str.endswith(GROUP_SUFFIXES).fillna(False) | stripped.isin(GROUP_NAMES))
+    return stripped.where(is_group).ffill()
+
+
+# 명단 데이터프레임에서 (이름, 그룹) 목록 추출
+# 첫 번째 열은 기관, 마지막 열(합계)은 제외하고 나머지 열을 행 순서대로 읽음
+def extract_persons(names_df):
+    import numpy as np
+    import pandas as pd
+
+    values = names_df.to_numpy(dtype=object)
+    n_rows, n_cols = values.shape
+    if n_rows == 0 or n_cols < 3:
+        return []
+
+    groups = _fill_groups(values[:, 0]).to_numpy(dtype=object)
+
+    # 이름 열을 행 우선 순서로 펼침 (기존 i, j 이중 루프와 같은 순서)
+    block = values[:, 1:n_cols - 1]
+    cells = pd.Series(block.ravel(), dtype=object)
+    row_groups = np.repeat(groups, block.shape[1])
+
+    present = cells.notna().to_numpy()
+    cells = cells[present].astype(str).str.strip()
+    row_groups = row_groups[present]
+
+    # 이름인지 확인 (공백 제거 후 길이 2~6자, 숫자나 특정 키워드 아님)
+    lengths = cells.str.len()
+    is_name = (
+        lengths.between(2, 6)
+        & ~cells.str.isdigit()
+        & ~cells.str.contains(".", regex=False)  # 소수점 있는 숫자 제외
+        & ~cells.isin(NON_NAME_VALUES)
+        & pd.notna(row_groups)
+    ).to_numpy()
+
+    return [
+        {'이름': name, '그룹': group}
+        for name, group in zip(cells.to_numpy()[is_name], row_groups[is_name])
+    ]
+
+
+# 중복 제거 (동명이인은 유지 - 그룹과 함께 고려)
+# 사람 목록 대신 생성기를 넘겨도 됨
+def dedupe_persons(persons):
+    result = []
+    seen = set()
+    for person in persons:
+        # 이름과 그룹을 함께 키로 사용
+        key = f"{person['이름']}_{person['그룹']}"
+        if key not in seen:
+            seen.add(key)
+            result.append(person)
+    return result
+
+
+# 지난번 결과에서 앞쪽(1~21번)에 앉았던 사람으로 보는 번호 범위
+PREV_FRONT_RANGE = (1, 21)
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+# pandas의 셀 변환과 맞춤 (정수 값 실수는 정수로, 오류 값은 빈 셀로)
+def _cell_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in ERROR_CODES:
+        return None
+    return value
+
+
+def _group_of(value):
+    if isinstance(value, str):
+        group_str = value.strip()
+        if group_str.endswith(GROUP_SUFFIXES) or group_str in GROUP_NAMES:
+            return group_str
+    return None
+
+
+def _is_name(value_str):
+    return (
+        2 <= len(value_str) <= 6 and
+        not value_str.isdigit() and
+        "." not in value_str and  # 소수점 있는 숫자 제외
+        value_str not in NON_NAME_VALUES
+    )
+
+
+def _open_read_only(source):
+    import openpyxl
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    _rewind(source)
+    try:
+        return openpyxl.load_workbook(source, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile):
+        # .xls 등 openpyxl로 읽을 수 없는 형식
+        return None
+
+
+# 명단 시트를 한 행씩 읽어 (기관, 이름) 튜플을 바로 넘겨주는 생성기
+# 첫 행은 머리글, 첫 번째 열은 기관, 마지막 열(합계)은 제외
+# 마지막 열은 시트에 기록된 크기 기준이라 서식만 있는 빈 열이 있으면 합계 열도 읽게 되지만,
+# 합계 열은 숫자뿐이라 이름으로 걸러지지 않음
+def iter_roster(source):
+    wb = _open_read_only(source)
+    if wb is None:
+        import pandas as pd
+
+        _rewind(source)
+        for person in extract_persons(pd.read_excel(source)):
+            yield person['그룹'], person['이름']
+        return
+
+    try:
+        ws = wb.worksheets[0]
+        n_cols = ws.max_column
+        if n_cols is None:
+            ws.calculate_dimension(force=True)
+            n_cols = ws.max_column
+
+        current_group = None
+        rows = ws.iter_rows(min_row=2, values_only=True)
+        for row in rows:
+            if not row:
+                continue
+            group = _group_of(row[0])
+            if group:
+                current_group = group
+            if not current_group:
+                continue
+
+            for value in row[1:n_cols - 1]:
+                value = _cell_value(value)
+                if value is None:
+                    continue
+                value_str = str(value).strip()
+                if _is_name(value_str):
+                    yield current_group, value_str
+    finally:
+        wb.close()
+
+
+def _number_of(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+# pandas로 읽은 이전 결과 시트에서 앞쪽 배치자 추출 (.xls용)
+def _prev_front_names_from_df(prev_df):
+    import pandas as pd
+
+    if "당첨번호" not in prev_df.columns or "이름" not in prev_df.columns:
+        return set()
+    numbers = pd.to_numeric(prev_df["당첨번호"], errors="coerce")
+    lo, hi = PREV_FRONT_RANGE
+    return set(prev_df[numbers.between(lo, hi, inclusive="both")]["이름"].dropna().astype(str).str.strip())
+
+
+# 두 번째 시트(이전 결과)에서 지난번 앞쪽 배치자 이름 추출
+# '당첨번호', '이름' 두 열만 읽음
+def read_prev_front_names(source):
+    wb = _open_read_only(source)
+    if wb is None:
+        import pandas as pd
+
+        _rewind(source)
+        xl = pd.ExcelFile(source)
+        if len(xl.sheet_names) < 2:
+            return set()
+        return _prev_front_names_from_df(xl.parse(xl.sheet_names[1]))
+
+    try:
+        if len(wb.worksheets) < 2:
+            return set()
+        rows = wb.worksheets[1].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if "당첨번호" not in header or "이름" not in header:
+            return set()
+        number_idx = header.index("당첨번호")
+        name_idx = header.index("이름")
+
+        lo, hi = PREV_FRONT_RANGE
+        names = set()
+        for row in rows:
+            if len(row) <= max(number_idx, name_idx):
+                continue
+            number = _number_of(row[number_idx])
+            name = _cell_value(row[name_idx])
+            if number is not None and lo <= number <= hi and name is not None:
+                names.add(str(name).strip())
+        return names
+    finally:
+        wb.close()
+
+
+# 이전 결과 파일에서 좌석 배정을 읽는 시트 (export가 만드는 당첨번호순 결과)
+PREVIOUS_RESULT_SHEET = "당첨번호순 결과"
+
+
+# 좌석 번호 정리 (정수 값은 int, '의자N'은 그대로, 그 밖의 값은 None)
+def _seat_of(value):
+    value = _cell_value(value)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        return value or None
+    return None
+
+
+# 이전 결과 파일의 "당첨번호순 결과" 시트에서 (당첨번호, 이름) 목록 읽기
+# 파일이나 시트, 머리글이 없으면 ValueError
+def read_previous_assignments(source):
+    wb = _open_read_only(source)
+    if wb is None:
+        raise ValueError("이전 결과 파일은 .xlsx 형식이어야 합니다.")
+
+    try:
+        if PREVIOUS_RESULT_SHEET not in wb.sheetnames:
+            raise ValueError(f"이전 결과 파일에 '{PREVIOUS_RESULT_SHEET}' 시트가 없습니다.")
+        rows = wb[PREVIOUS_RESULT_SHEET].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if "당첨번호" not in header or "이름" not in header:
+            raise ValueError(f"'{PREVIOUS_RESULT_SHEET}' 시트에 당첨번호, 이름 머리글이 없습니다.")
+        number_idx = header.index("당첨번호")
+        name_idx = header.index("이름")
+
+        assignments = []
+        for row in rows:
+            if len(row) <= max(number_idx, name_idx):
+                continue
+            seat = _seat_of(row[number_idx])
+            name = _cell_value(row[name_idx])
+            if seat is not None and name is not None:
+                assignments.append((seat, str(name).strip()))
+        return assignments
+    finally:
+        wb.close()
+
+
+# 결과 파일의 사용자 지정 문서 속성 {이름: 값} (난수 씨앗 등, rng 참고)
+def read_result_properties(source):
+    wb = _open_read_only(source)
+    if wb is None:
+        raise ValueError("결과 파일은 .xlsx 형식이어야 합니다.")
+
+    try:
+        return {prop.name: prop.value for prop in wb.custom_doc_props.props}
+    finally:
+        wb.close()
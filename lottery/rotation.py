@@ -0,0 +1,102 @@
+# 여러 주에 걸친 좌석 순환 시뮬레이터
+# 매주 제비뽑기를 이어서 실행하며 구역별 누적 횟수(exposure)를 세고,
+# 가중치 없이 뽑을 때와 누적 횟수로 가중치를 줄 때의 사람 간 횟수 분산을 비교
+#
+# 실행: python -m lottery.rotation 명단.xlsx --rules lottery_app --draws 52 --seasons 20
+import argparse
+import random
+import statistics
+import time
+
+from .assignment import assign_seats, build_rules, is_chair, make_seat_pool
+from .exposure import ZONE_LABELS, ZONES, ExposureCounter, exposure_weights, person_key, zone_bounds
+from .rules import DEFAULT_RULES, available_rules, load_plan
+from .roster import PREV_FRONT_RANGE, dedupe_persons, iter_roster
+
+
+# draws번 매주 제비뽑기를 이어서 실행하고 사람별 누적 횟수를 반환
+# 지난번 앞쪽(1~21번) 배치자 규칙도 실제처럼 직전 결과로 적용
+# balance가 False면 가중치 없이 (기존 방식) 배정
+def simulate_season(persons, config, draws=52, balance=True, rng=random):
+    counter = ExposureCounter(zone_bounds(config))
+    lo, hi = PREV_FRONT_RANGE
+    prev_front_names = set()
+    for _ in range(draws):
+        seat_pool = make_seat_pool(config)
+        rules = build_rules(persons, config, prev_front_names)
+        weights = exposure_weights(persons, counter.counts) if balance else None
+        seats = assign_seats(persons, rules, seat_pool, rng, weights)
+        counter.update(persons, seats)
+        if config.get('prev_front_min_seat') is not None:
+            prev_front_names = {
+                p['이름'] for p, seat in zip(persons, seats) if not is_chair(seat) and lo <= seat <= hi
+            }
+    return counter.counts
+
+
+# 규칙별 구역 횟수의 사람 간 분산 {규칙: [구역별 분산]}
+# 규칙은 지난번 앞쪽 배치자 없이 만든 것 (매주 바뀌는 규칙 제외)
+def zone_variances(persons, config, counts):
+    rules = build_rules(persons, config)
+    by_label = {}
+    for person, rule in zip(persons, rules):
+        by_label.setdefault(rule.label, []).append(counts[person_key(person)])
+    return {
+        label: [statistics.pvariance([row[z] for row in rows]) for z in range(len(ZONES))]
+        for label, rows in by_label.items()
+        if len(rows) > 1
+    }
+
+
+# seasons번 시뮬레이션한 분산의 평균 {규칙: [구역별 분산]}, 규칙별 인원 수
+def average_variances(persons, config, draws, seasons, balance, seed):
+    rng = random.Random(seed)
+    totals = {}
+    for _ in range(seasons):
+        counts = simulate_season(persons, config, draws, balance, rng)
+        for label, variances in zone_variances(persons, config, counts).items():
+            total = totals.setdefault(label, [0.0] * len(ZONES))
+            for z, variance in enumerate(variances):
+                total[z] += variance / seasons
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 주 좌석 순환 시뮬레이션 (가중치 유무별 구역 횟수 분산 비교)")
+    parser.add_argument("roster", help="명단 엑셀 파일")
+    parser.add_argument("--rules", "--preset", default=DEFAULT_RULES,
+                        help=f"좌석 배정 규칙 이름({', '.join(available_rules())}) 또는 규칙 파일(.json) 경로")
+    parser.add_argument("--draws", type=int, default=52, help="한 시즌의 제비뽑기 횟수 (기본 52주)")
+    parser.add_argument("--seasons", type=int, default=20, help="평균을 낼 시즌 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = load_plan(args.rules)
+    with open(args.roster, 'rb') as f:
+        persons = dedupe_persons({'이름': name, '그룹': group} for group, name in iter_roster(f))
+
+    results = {}
+    for balance in (False, True):
+        start = time.perf_counter()
+        results[balance] = average_variances(persons, config, args.draws, args.seasons, balance, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"{'가중치' if balance else '기존'}: {args.seasons}시즌 × {args.draws}회, {elapsed:.1f}초")
+
+    rules = build_rules(persons, config)
+    sizes = {}
+    for rule in rules:
+        sizes[rule.label] = sizes.get(rule.label, 0) + 1
+
+    print(f"\n{len(persons)}명, 구역 경계 {zone_bounds(config)} (사람 간 구역 횟수 분산: 기존 → 가중치)")
+    print(f"{'규칙':<14} {'인원':>5} " + " ".join(f"{ZONE_LABELS[zone]:>20}" for zone in ZONES))
+    for label, before in results[False].items():
+        after = results[True][label]
+        cells = []
+        for b, a in zip(before, after):
+            change = f"({(a - b) / b * 100:+.0f}%)" if b else ""
+            cells.append(f"{b:6.2f} → {a:5.2f} {change:>6}")
+        print(f"{label:<14} {sizes[label]:>5} " + " ".join(f"{cell:>20}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
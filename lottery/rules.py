@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from .assignment import compile_rules, seat_list
+
+# 좌석 배정 규칙 파일 (rules/<이름>.json)
+# 파일을 검사해 기본값을 채운 뒤 바꿀 수 없는 배정 계획(AssignmentPlan)으로 한 번만 만들어 두고,
+# 파일 수정 시각이 바뀌면 다시 읽음 (새 장소는 규칙 파일만 추가하면 됨)
+
+# 앱 디렉토리와 규칙 파일 폴더 (장소별 좌석 배치표 경로는 앱 디렉토리 기준)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RULES_DIR = os.path.join(APP_DIR, "rules")
+
+DEFAULT_RULES = 'lottery_app'
+
+# 서버 프로세스당 한 번만 읽고, 파일 수정 시각이 바뀌면 다시 읽음
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class RuleError(ValueError):
+    pass
+
+
+# 배정 계획: 검사한 설정(읽기 전용 dict처럼 씀)과 미리 만든 좌석 목록, 규칙 묶음
+# 설정 dict 대신 그대로 넘기면 make_seat_pool과 build_rules가 미리 만든 것을 씀
+# name: 규칙 이름 (제비뽑기 기록을 나누는 이름), version: (이름, 파일 수정 시각) 캐시 키
+# inventory: 장소(venues)가 있는 규칙이면 배치표에서 읽은 좌석 목록 (inventory.SeatInventory), 없으면 None
+class AssignmentPlan(Mapping):
+    __slots__ = ('name', 'description', 'path', 'version', 'seats', 'rule_set', 'inventory', '_config')
+
+    def __init__(self, name, config, description='', path=None, version=None):
+        config = dict(config)
+        config['special_seat_ranges'] = MappingProxyType(dict(config.get('special_seat_ranges') or {}))
+        config['venues'] = tuple(tuple(venue) for venue in config['venues']) if config.get('venues') else None
+        config = MappingProxyType(config)
+        inventory = _load_inventory(config['venues']) if config['venues'] else None
+        seats = inventory.ids if inventory else tuple(seat_list(config))
+        for attr, value in [
+            ('name', name), ('description', description), ('path', path), ('version', version or (name, None)),
+            ('seats', seats), ('rule_set', compile_rules(config)), ('inventory', inventory), ('_config', config),
+        ]:
+            object.__setattr__(self, attr, value)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("배정 계획은 바꿀 수 없습니다.")
+
+    def __getitem__(self, key):
+        return self._config[key]
+
+    def __iter__(self):
+        return iter(self._config)
+
+    def __len__(self):
+        return len(self._config)
+
+    def __reduce__(self):
+        config = dict(self._config, special_seat_ranges=dict(self._config['special_seat_ranges']))
+        return (AssignmentPlan, (self.name, config, self.description, self.path, self.version))
+
+    def __repr__(self):
+        return f"AssignmentPlan({self.name!r}, seat_count={self['seat_count']}, chair_count={self['chair_count']})"
+
+
+# 장소 목록 [(이름, 배치표 경로)]의 좌석 목록 (배치표를 읽으므로 장소가 있는 규칙에서만 불러옴)
+def _load_inventory(venues):
+    from .inventory import load_inventory
+
+    try:
+        return load_inventory(venues, APP_DIR)
+    except (OSError, KeyError, ValueError) as e:
+        raise RuleError(f"venues: 좌석 배치표를 읽을 수 없습니다: {e}")
+
+
+# 장소 목록 검사: [{"name": 이름, "chart": 좌석 배치표 파일}] → ((이름, 배치표), ...)
+# 이름은 결과 파일의 시트 이름에도 쓰므로 엑셀 시트 이름에 못 쓰는 문자는 오류
+def _venues(value):
+    if not (isinstance(value, list) and value):
+        raise RuleError("venues: 장소 목록이어야 합니다.")
+    venues = []
+    for i, venue in enumerate(value):
+        if not (isinstance(venue, dict) and set(venue) == {'name', 'chart'}
+                and all(isinstance(venue[k], str) and venue[k] for k in ('name', 'chart'))):
+            raise RuleError(f"venues[{i}]: {{\"name\": 이름, \"chart\": 좌석 배치표 파일}} 형식이어야 합니다.")
+        name = venue['name']
+        if len(name) > 20 or any(c in name for c in '[]:*?/\\'):
+            raise RuleError(f"venues[{i}]: 장소 이름은 20자 이하이고 []:*?/\\ 문자가 없어야 합니다.")
+        venues.append((name, venue['chart']))
+    names = [name for name, _ in venues]
+    if len(set(names)) != len(names):
+        raise RuleError("venues: 장소 이름이 중복되었습니다.")
+    return tuple(venues)
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# [시작, 끝] 좌석 범위 검사 (1 <= 시작 <= 끝 <= seat_count)
+def _seat_range(value, key, seat_count):
+    if not (isinstance(value, (list, tuple)) and len(value) == 2 and all(_is_int(v) for v in value)):
+        raise RuleError(f"{key}: [시작, 끝] 형식의 좌석 번호 두 개여야 합니다.")
+    lo, hi = value
+    if not 1 <= lo <= hi <= seat_count:
+        raise RuleError(f"{key}: 좌석 범위 {lo}~{hi}이(가) 일반 좌석 1~{seat_count}를 벗어납니다.")
+    return (lo, hi)
+
+
+def _seat_number(value, key, seat_count):
+    if not _is_int(value) or not 1 <= value <= seat_count:
+        raise RuleError(f"{key}: 1~{seat_count} 사이의 좌석 번호여야 합니다.")
+    return value
+
+
+# 규칙 파일 내용(dict) 검사, 기본값을 채운 설정 dict 반환 (항목 설명은 assignment.compile_rules)
+# 모르는 항목은 오타일 수 있으므로 오류
+def validate_rules(data):
+    if not isinstance(data, dict):
+        raise RuleError("규칙 파일은 JSON 객체여야 합니다.")
+    known = {
+        'description', 'seat_count', 'chair_count', 'front_seats', 'special_seat_ranges', 'special_groups',
+        'special_group_min_seat', 'special_group_overflow', 'prev_front_min_seat', 'prev_front_draws',
+        'exposure_balance', 'exposure_zones', 'venues',
+    }
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise RuleError(f"알 수 없는 항목: {', '.join(unknown)}")
+
+    # 장소가 있으면 좌석 수, 의자 수는 배치표에서 셈 (적어 두었으면 배치표와 같아야 함)
+    venues = None
+    if data.get('venues') is not None:
+        venues = _venues(data['venues'])
+        inventory = _load_inventory(venues)
+        data = dict(data)
+        for key, count in (('seat_count', inventory.seat_count), ('chair_count', inventory.chair_count)):
+            if data.setdefault(key, count) != count:
+                raise RuleError(f"{key}: {data[key]}이(가) 좌석 배치표의 {count}와 다릅니다.")
+
+    for key in ('seat_count', 'chair_count'):
+        if key not in data:
+            raise RuleError(f"{key} 항목이 없습니다.")
+    seat_count = data['seat_count']
+    if not _is_int(seat_count) or seat_count < 1:
+        raise RuleError("seat_count: 1 이상의 정수여야 합니다.")
+    if not _is_int(data['chair_count']) or data['chair_count'] < 0:
+        raise RuleError("chair_count: 0 이상의 정수여야 합니다.")
+
+    config = {'seat_count': seat_count, 'chair_count': data['chair_count'], 'venues': venues}
+
+    front = data.get('front_seats')
+    config['front_seats'] = None if front is None else _seat_range(front, 'front_seats', seat_count)
+
+    ranges = data.get('special_seat_ranges') or {}
+    if not isinstance(ranges, dict):
+        raise RuleError("special_seat_ranges: {이름: [시작, 끝]} 형식이어야 합니다.")
+    config['special_seat_ranges'] = {
+        name: _seat_range(value, f"special_seat_ranges.{name}", seat_count) for name, value in ranges.items()
+    }
+
+    groups = data.get('special_groups') or []
+    if not (isinstance(groups, list) and all(isinstance(g, str) for g in groups)):
+        raise RuleError("special_groups: 그룹 이름 목록이어야 합니다.")
+    config['special_groups'] = tuple(groups)
+    config['special_group_min_seat'] = _seat_number(
+        data.get('special_group_min_seat', 1), 'special_group_min_seat', seat_count)
+    overflow = data.get('special_group_overflow', 'chair')
+    if overflow not in ('chair', 'any'):
+        raise RuleError("special_group_overflow: 'chair' 또는 'any'여야 합니다.")
+    config['special_group_overflow'] = overflow
+
+    prev_front_min = data.get('prev_front_min_seat')
+    config['prev_front_min_seat'] = (
+        None if prev_front_min is None else _seat_number(prev_front_min, 'prev_front_min_seat', seat_count))
+    prev_front_draws = data.get('prev_front_draws', 1)
+    if not _is_int(prev_front_draws) or prev_front_draws < 1:
+        raise RuleError("prev_front_draws: 1 이상의 정수여야 합니다.")
+    config['prev_front_draws'] = prev_front_draws
+
+    balance = data.get('exposure_balance', False)
+    if not isinstance(balance, bool):
+        raise RuleError("exposure_balance: true 또는 false여야 합니다.")
+    config['exposure_balance'] = balance
+    zones = data.get('exposure_zones')
+    if zones is not None:
+        zones = _seat_range(zones, 'exposure_zones', seat_count)
+        if zones[0] == zones[1]:
+            raise RuleError("exposure_zones: 앞 구역 끝이 가운데 구역 끝보다 작아야 합니다.")
+    config['exposure_zones'] = zones
+    return config
+
+
+# 규칙 이름(rules 폴더의 파일 이름) 또는 파일 경로 → 파일 경로
+def rules_path(name_or_path):
+    if name_or_path.endswith('.json') or os.sep in name_or_path:
+        return name_or_path
+    return os.path.join(RULES_DIR, f"{name_or_path}.json")
+
+
+# rules 폴더의 규칙 이름 목록
+def available_rules():
+    if not os.path.isdir(RULES_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(RULES_DIR) if f.endswith('.json'))
+
+
+def _compile(path, mtime):
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise RuleError(f"JSON 형식 오류 ({e.lineno}행 {e.colno}열): {e.msg}")
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        config = validate_rules(data)
+    except RuleError as e:
+        raise RuleError(f"{os.path.basename(path)}: {e}")
+    return AssignmentPlan(name, config, data.get('description', ''), path, (name, mtime))
+
+
+# 규칙 파일을 읽어 배정 계획 반환 (캐시 사용, 파일이 바뀌었으면 다시 읽음)
+# 장소별 좌석 배치표만 바꾸었을 때는 규칙 파일도 다시 저장해야 좌석 목록을 다시 만듦
+# 파일이 없으면 OSError, 형식이 틀리면 RuleError
+def load_plan(name_or_path=DEFAULT_RULES):
+    path = os.path.abspath(rules_path(name_or_path))
+    mtime = os.stat(path).st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached.version[1] == mtime:
+            return cached
+        plan = _compile(path, mtime)
+        _cache[path] = plan
+        return plan
@@ -0,0 +1,141 @@
+import random
+
+
+# 좌석 관리 자료구조
+# 좌석은 만들 때 준 순서대로 위치(0, 1, 2, ...)를 가지며, 범위는 이 순서 기준
+# - 비트맵(bytearray)으로 빈 좌석 여부를 O(1)에 확인
+# - 펜윅 트리로 범위 안 빈 좌석 수와 k번째 빈 좌석을 O(log n)에 계산
+#   (배정/해제도 펜윅 트리 갱신 때문에 O(log n))
+class SeatPool:
+    def __init__(self, seats):
+        self._seats = list(seats)
+        self._pos = {seat: i for i, seat in enumerate(self._seats)}
+        if len(self._pos) != len(self._seats):
+            raise ValueError("좌석 번호가 중복되었습니다.")
+
+        n = len(self._seats)
+        self._free = bytearray([1]) * n
+        self._count = n
+
+        # 모든 좌석이 비어 있는 펜윅 트리를 O(n)에 구성
+        tree = [0] * (n + 1)
+        for i in range(1, n + 1):
+            tree[i] += 1
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+        self._top = 1
+        while self._top * 2 <= n:
+            self._top *= 2
+
+    # 빈 좌석 수
+    def __len__(self):
+        return self._count
+
+    # 빈 좌석인지 확인
+    def __contains__(self, seat):
+        pos = self._pos.get(seat)
+        return pos is not None and self._free[pos] == 1
+
+    # 전체 좌석 (배정 여부와 무관하게 만든 순서대로)
+    @property
+    def seats(self):
+        return list(self._seats)
+
+    def _add(self, pos, delta):
+        tree = self._tree
+        i = pos + 1
+        n = len(tree) - 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    # 위치 0..pos-1 중 빈 좌석 수
+    def _prefix(self, pos):
+        tree = self._tree
+        total = 0
+        i = pos
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    # k번째(0부터) 빈 좌석의 위치
+    def _find(self, k):
+        tree = self._tree
+        n = len(tree) - 1
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= k:
+                pos = nxt
+                k -= tree[nxt]
+            step //= 2
+        return pos
+
+    # 좌석의 위치 (앞 번호일수록 작음, 의자는 일반 좌석 뒤)
+    def position(self, seat):
+        return self._pos[seat]
+
+    # 좌석 범위(lo, hi 포함)를 위치 범위 [start, stop)로 변환, 생략하면 전체
+    def span(self, lo=None, hi=None):
+        start = 0 if lo is None else self._pos[lo]
+        stop = len(self._seats) if hi is None else self._pos[hi] + 1
+        return start, max(start, stop)
+
+    # 좌석 배정 (이미 배정된 좌석이면 오류)
+    def reserve(self, seat):
+        pos = self._pos[seat]
+        if not self._free[pos]:
+            raise ValueError(f"{seat}번 좌석은 이미 배정되었습니다.")
+        self._free[pos] = 0
+        self._count -= 1
+        self._add(pos, -1)
+
+    # 배정 해제
+    def release(self, seat):
+        pos = self._pos[seat]
+        if self._free[pos]:
+            raise ValueError(f"{seat}번 좌석은 배정되지 않았습니다.")
+        self._free[pos] = 1
+        self._count += 1
+        self._add(pos, 1)
+
+    # 범위 안 빈 좌석 수
+    def count(self, lo=None, hi=None):
+        start, stop = self.span(lo, hi)
+        return self.count_span(start, stop)
+
+    # 위치 범위 [start, stop) 안 빈 좌석 수
+    def count_span(self, start, stop):
+        return self._prefix(stop) - self._prefix(start)
+
+    # 좌석 위치별 빈 좌석 여부 (1: 빈 좌석) 바이트열, NumPy 배열로 바로 바꿀 수 있음 (kernel)
+    def free_flags(self):
+        return bytes(self._free)
+
+    # 범위 안 빈 좌석 목록 (좌석 순서대로)
+    def free_seats(self, lo=None, hi=None):
+        start, stop = self.span(lo, hi)
+        free = self._free
+        return [self._seats[i] for i in range(start, stop) if free[i]]
+
+    # 범위 안 첫 번째 빈 좌석 (없으면 None)
+    def first(self, lo=None, hi=None):
+        start, stop = self.span(lo, hi)
+        before = self._prefix(start)
+        if self._prefix(stop) == before:
+            return None
+        return self._seats[self._find(before)]
+
+    # 범위 안 빈 좌석 중 하나를 균등하게 뽑음 (없으면 None, 배정은 하지 않음)
+    def sample(self, lo=None, hi=None, rng=random):
+        start, stop = self.span(lo, hi)
+        before = self._prefix(start)
+        available = self._prefix(stop) - before
+        if available == 0:
+            return None
+        return self._seats[self._find(before + rng.randrange(available))]
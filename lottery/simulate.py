@@ -0,0 +1,178 @@
+# 제비뽑기 공정성 시뮬레이터
+# assign_seats와 같은 규칙(build_rules)을 배정 커널(kernel)과 같은 단계로 바꿔 NumPy 배열 연산으로 여러 번 한꺼번에 뽑아
+# 그룹별/규칙별로 좌석 구간에 앉을 확률을 계산
+# 구역 누적 횟수 가중치(규칙의 exposure_balance)는 기록에 따라 달라지므로 넣지 않음: 가중치를 끈 규칙의 균등 추첨만 설명함
+#
+# 실행: python -m lottery.simulate 명단.xlsx --rules lottery_app --draws 1000000
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .assignment import build_rules, is_chair, make_seat_pool
+from .kernel import compile_steps
+from .roster import dedupe_persons, iter_roster, read_prev_front_names
+from .rules import DEFAULT_RULES, available_rules, load_plan
+
+# 한 번에 계산할 추첨 수 (메모리 사용량 조절)
+DEFAULT_BATCH_SIZE = 4096
+
+# 시뮬레이션에 필요한 모든 배열 (프로세스 간에 그대로 넘길 수 있음)
+Plan = namedtuple('Plan', ['n_persons', 'n_seats', 'steps', 'seat_bins', 'bin_labels', 'person_keys'])
+
+
+# 좌석 구간 (기본: 1~19, 20~49, 50~150, 151~끝, 의자)
+def default_bins(seat_count):
+    bins = [(1, 19), (20, 49), (50, 150), (151, seat_count)]
+    return [(lo, hi) for lo, hi in bins if lo <= min(hi, seat_count)]
+
+
+def _seat_bins(seats, bins):
+    seat_bins = np.full(len(seats) + 1, len(bins) + 1, dtype=np.int64)  # 마지막 칸: 배정 실패
+    labels = [f"{lo}~{hi}" for lo, hi in bins] + ["의자", "미배정"]
+    for i, seat in enumerate(seats):
+        if is_chair(seat):
+            seat_bins[i] = len(bins)
+            continue
+        for b, (lo, hi) in enumerate(bins):
+            if lo <= seat <= hi:
+                seat_bins[i] = b
+                break
+    return seat_bins, labels
+
+
+# 사람 목록과 규칙으로 시뮬레이션 계획 생성 (배정 단계는 kernel.compile_steps)
+def compile_plan(persons, rules, seat_pool, bins=None):
+    seats = seat_pool.seats
+    if bins is None:
+        bins = default_bins(max((s for s in seats if not is_chair(s)), default=0))
+
+    steps = compile_steps(rules, seat_pool)
+    seat_bins, labels = _seat_bins(seats, bins)
+    person_keys = [(p['그룹'], rule.label) for p, rule in zip(persons, rules)]
+    return Plan(len(persons), len(seats), steps, seat_bins, labels, person_keys)
+
+
+# n_draws번 추첨한 결과를 (추첨, 사람) → 좌석 위치 배열로 반환 (배정 실패는 n_seats)
+def draw_batch(plan, n_draws, rng):
+    n_seats = plan.n_seats
+    seat_of = np.full((n_draws, plan.n_persons), n_seats, dtype=np.int64)
+    # 마지막 열은 배정 실패를 기록하는 자리
+    used = np.zeros((n_draws, n_seats + 1), dtype=bool)
+    draws = np.arange(n_draws)
+
+    for step in plan.steps:
+        if step.kind == 'block':
+            # 좌석 키: 우선순위 + 균등 난수, 이미 배정된 좌석은 제외
+            keys = step.base + step.noise * rng.random((n_draws, n_seats))
+            keys[used[:, :n_seats]] = np.inf
+            count = len(step.persons)
+            order = np.argsort(keys, axis=1)[:, :count]
+            ok = np.isfinite(np.take_along_axis(keys, order, axis=1))
+            # 사람 순서를 추첨마다 섞어 정렬된 좌석과 짝지음
+            persons = rng.permuted(np.broadcast_to(step.persons, (n_draws, count)), axis=1)
+            chosen = np.where(ok, order, n_seats)
+            np.put_along_axis(seat_of, persons, chosen, axis=1)
+            np.put_along_axis(used, chosen, True, axis=1)
+        else:
+            count = len(step.persons)
+            turns = rng.permuted(np.broadcast_to(np.arange(count), (n_draws, count)), axis=1)
+            for t in range(count):
+                who = turns[:, t]
+                keys = step.base[who] + step.noise[who] * rng.random((n_draws, n_seats))
+                keys[used[:, :n_seats]] = np.inf
+                choice = np.argmin(keys, axis=1)
+                chosen = np.where(np.isfinite(keys[draws, choice]), choice, n_seats)
+                seat_of[draws, step.persons[who]] = chosen
+                used[draws, chosen] = True
+
+    return seat_of
+
+
+# 사람별 좌석 구간 횟수 (사람 × 구간)
+def _count_bins(plan, n_draws, seed):
+    rng = np.random.default_rng(seed)
+    seat_of = draw_batch(plan, n_draws, rng)
+    bins = plan.seat_bins[seat_of]
+    n_bins = len(plan.bin_labels)
+    flat = np.arange(plan.n_persons)[None, :] * n_bins + bins
+    return np.bincount(flat.ravel(), minlength=plan.n_persons * n_bins).reshape(plan.n_persons, n_bins)
+
+
+def _count_chunks(args):
+    plan, sizes, seeds = args
+    total = np.zeros((plan.n_persons, len(plan.bin_labels)), dtype=np.int64)
+    for size, seed in zip(sizes, seeds):
+        total += _count_bins(plan, size, seed)
+    return total
+
+
+# n_draws번 추첨해 사람별 좌석 구간 횟수를 합산 (여러 프로세스에 나눠 실행)
+def simulate(plan, n_draws, seed=None, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    sizes = [batch_size] * (n_draws // batch_size)
+    if n_draws % batch_size:
+        sizes.append(n_draws % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(sizes) <= 1:
+        return _count_chunks((plan, sizes, seeds))
+
+    jobs = [(plan, sizes[w::workers], seeds[w::workers]) for w in range(workers)]
+    jobs = [job for job in jobs if job[1]]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        return sum(pool.map(_count_chunks, jobs))
+
+
+# 사람별 횟수를 묶음별 확률표로 (행: 묶음, 열: 좌석 구간, 값: 한 사람이 그 구간에 앉을 확률)
+def probability_table(plan, counts, n_draws, by='그룹'):
+    index = 0 if by == '그룹' else 1
+    keys = [key[index] for key in plan.person_keys]
+    df = pd.DataFrame(counts, columns=plan.bin_labels)
+    df[by] = keys
+    table = df.groupby(by, sort=True).sum()
+    table = table.div(pd.Series(keys).value_counts().reindex(table.index) * n_draws, axis=0)
+    table.insert(0, '인원', pd.Series(keys).value_counts().reindex(table.index))
+    if not table['미배정'].any():
+        table = table.drop(columns='미배정')
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="제비뽑기 공정성 시뮬레이션")
+    parser.add_argument("roster", help="명단 엑셀 파일 (두 번째 시트: 이전 결과)")
+    parser.add_argument("--rules", "--preset", default=DEFAULT_RULES,
+                        help=f"좌석 배정 규칙 이름({', '.join(available_rules())}) 또는 규칙 파일(.json) 경로")
+    parser.add_argument("--draws", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    config = load_plan(args.rules)
+    with open(args.roster, 'rb') as f:
+        prev_front_names = read_prev_front_names(f)
+        persons = dedupe_persons({'이름': name, '그룹': group} for group, name in iter_roster(f))
+
+    seat_pool = make_seat_pool(config)
+    rules = build_rules(persons, config, prev_front_names)
+    plan = compile_plan(persons, rules, seat_pool)
+
+    start = time.perf_counter()
+    counts = simulate(plan, args.draws, seed=args.seed, workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    pd.set_option('display.width', 200)
+    print(f"{len(persons)}명, {args.draws:,}회 추첨, {elapsed:.1f}초")
+    print("\n[그룹별 좌석 구간 확률]")
+    print(probability_table(plan, counts, args.draws, by='그룹').round(4).to_string())
+    print("\n[규칙별 좌석 구간 확률]")
+    print(probability_table(plan, counts, args.draws, by='규칙').round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
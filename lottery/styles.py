@@ -0,0 +1,56 @@
+from functools import lru_cache
+
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+# 결과 시트 공용 스타일
+# 스타일 객체는 프로세스당 한 번만 만들고, 모든 셀과 워크북에서 같은 객체를 참조함
+
+TITLE_FONT = Font(bold=True, size=16)
+BOLD_FONT = Font(bold=True)
+CENTER = Alignment(horizontal='center', vertical='center')
+LIGHT_BLUE_FILL = PatternFill(start_color="B8CCE4", end_color="B8CCE4", fill_type="solid")
+GRAY_FILL = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+
+
+# 네 변의 선 종류('thin', 'medium', None)로 테두리 (같은 조합이면 같은 객체)
+@lru_cache(maxsize=None)
+def sides_border(left=None, right=None, top=None, bottom=None):
+    return Border(
+        left=Side(style=left),
+        right=Side(style=right),
+        top=Side(style=top),
+        bottom=Side(style=bottom)
+    )
+
+
+# 테두리의 네 변 선 종류 (left, right, top, bottom)
+def border_styles(border):
+    return tuple(side.style if side else None for side in (border.left, border.right, border.top, border.bottom))
+
+
+THIN_BORDER = sides_border('thin', 'thin', 'thin', 'thin')
+
+# 이름 있는 스타일: {이름: (font, border, fill, alignment)}
+RESULT_STYLES = {
+    '결과 제목': (TITLE_FONT, None, None, CENTER),
+    '결과 굵게': (BOLD_FONT, None, None, CENTER),          # 날짜, (가나다순)
+    '결과 이름': (BOLD_FONT, THIN_BORDER, None, CENTER),   # 머리글, 이름 셀
+    '결과 번호': (BOLD_FONT, THIN_BORDER, LIGHT_BLUE_FILL, CENTER),
+    '번호순 머리글': (BOLD_FONT, THIN_BORDER, GRAY_FILL, CENTER),
+    '번호순 번호': (None, THIN_BORDER, LIGHT_BLUE_FILL, CENTER),
+    '번호순 이름': (None, THIN_BORDER, None, CENTER),
+}
+
+
+# 워크북에 결과 스타일 등록 (이후 셀에는 cell.style = '결과 이름'처럼 이름으로 지정)
+# 지정하지 않은 글꼴/테두리는 워크북 기본값 (스타일 없는 셀과 같게)
+def add_result_styles(wb):
+    for name, (font, border, fill, alignment) in RESULT_STYLES.items():
+        style = NamedStyle(name=name, font=font or DEFAULT_FONT, border=border or DEFAULT_BORDER)
+        if fill:
+            style.fill = fill
+        if alignment:
+            style.alignment = alignment
+        wb.add_named_style(style)
@@ -0,0 +1,378 @@
+import os
+import posixpath
+import re
+import threading
+import zipfile
+from collections import namedtuple
+from copy import copy
+
+import openpyxl
+from openpyxl.styles import Alignment, Border, Font, Protection
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.cell import coordinate_from_string
+
+from .assignment import chair_label
+
+# 좌석 배치표 템플릿을 미리 풀어 둔 형태
+# cells: (행, 열, 값, 스타일) 목록, 스타일은 (font, border, fill, alignment, number_format, protection) 또는 None
+# images: (이미지 바이트, 위치) 목록
+TemplateDigest = namedtuple('TemplateDigest', [
+    'cells', 'merged_ranges', 'row_heights', 'column_dimensions', 'max_column',
+    'page_setup', 'page_margins', 'print_options', 'print_area', 'images',
+])
+
+# 좌석 배치표 템플릿 파일(xlsx 패키지)을 그대로 옮겨 심기 위한 형태
+# sheet_xml: 첫 번째(활성) 시트 XML (공유 문자열은 셀 안 문자열로 바꿔 둠)
+# sheet_part: 시트 XML 경로, parts: 패키지의 모든 파일 {경로: 바이트}
+# overrides/defaults: [Content_Types].xml의 {경로: 형식}/{확장자: 형식}
+# styles: {'numFmts': [(번호, 태그)], 'fonts'/'fills'/'borders'/'cellXfs'/'dxfs': [태그 문자열]}
+# sheet_name: 원본 시트 이름, defined_names: 시트 전용 이름 정의 [(이름, 참조)]
+TemplatePackage = namedtuple('TemplatePackage', [
+    'sheet_xml', 'sheet_part', 'parts', 'overrides', 'defaults', 'styles', 'sheet_name', 'defined_names',
+])
+
+# 좌석 번호 셀의 수식 (다른 셀 + 정수, 예: B4+1)
+SEAT_FORMULA = re.compile(r'^(\$?)([A-Z]+)(\$?)(\d+)\s*(?:([+-])\s*(\d+))?$')
+
+# 스타일 시트에서 옮겨 올 목록 (목록 태그, 항목 태그)
+STYLE_LISTS = [('fonts', 'font'), ('fills', 'fill'), ('borders', 'border'), ('cellXfs', 'xf'), ('dxfs', 'dxf')]
+
+# 서버 프로세스당 한 번만 읽고, 파일 수정 시각이 바뀌면 다시 읽음
+# (좌석 셀 색인은 캐시된 패키지로 만들므로 같은 스레드에서 다시 잠글 수 있어야 함)
+_cache = {}
+_cache_lock = threading.RLock()
+
+
+def _cell_style(cell):
+    if not cell.has_style:
+        return None
+
+    font = None
+    if cell.font:
+        font = Font(
+            name=cell.font.name,
+            size=cell.font.size,
+            bold=cell.font.bold,
+            italic=cell.font.italic,
+            vertAlign=cell.font.vertAlign,
+            underline=cell.font.underline,
+            strike=cell.font.strike,
+            color=cell.font.color
+        )
+
+    border = None
+    if cell.border:
+        border = Border(
+            left=copy(cell.border.left) if cell.border.left else None,
+            right=copy(cell.border.right) if cell.border.right else None,
+            top=copy(cell.border.top) if cell.border.top else None,
+            bottom=copy(cell.border.bottom) if cell.border.bottom else None,
+            diagonal=copy(cell.border.diagonal) if cell.border.diagonal else None,
+            diagonalUp=cell.border.diagonalUp,
+            diagonalDown=cell.border.diagonalDown
+        )
+
+    fill = copy(cell.fill) if cell.fill and cell.fill.fill_type else None
+
+    alignment = None
+    if cell.alignment:
+        alignment = Alignment(
+            horizontal=cell.alignment.horizontal,
+            vertical=cell.alignment.vertical,
+            textRotation=cell.alignment.textRotation,
+            wrapText=cell.alignment.wrapText,
+            shrinkToFit=cell.alignment.shrinkToFit,
+            indent=cell.alignment.indent
+        )
+
+    protection = None
+    if cell.protection:
+        protection = Protection(
+            locked=cell.protection.locked,
+            hidden=cell.protection.hidden
+        )
+
+    return (font, border, fill, alignment, cell.number_format, protection)
+
+
+def _digest(path):
+    src_wb = openpyxl.load_workbook(path)
+    src_ws = src_wb.active  # 첫 번째 시트
+
+    cells = [
+        (row_idx, col_idx, cell.value, _cell_style(cell))
+        for row_idx, row in enumerate(src_ws.rows, 1)
+        for col_idx, cell in enumerate(row, 1)
+    ]
+
+    row_heights = {
+        row_idx: src_ws.row_dimensions[row_idx].height
+        for row_idx in range(1, src_ws.max_row + 1)
+        if row_idx in src_ws.row_dimensions and src_ws.row_dimensions[row_idx].height
+    }
+
+    column_dimensions = {}
+    for col_idx in range(1, src_ws.max_column + 1):
+        col_letter = get_column_letter(col_idx)
+        if col_letter in src_ws.column_dimensions:
+            dim = src_ws.column_dimensions[col_letter]
+            column_dimensions[col_letter] = (dim.width, dim.hidden)
+
+    # 원본 인쇄 영역이 있으면 사용, 없으면 전체 데이터 영역
+    if src_ws.print_area:
+        print_area = src_ws.print_area
+    else:
+        max_row = max((c.row for c in src_ws._cells.values()), default=1)
+        max_col = max((c.column for c in src_ws._cells.values()), default=1)
+        print_area = f"A1:{get_column_letter(max_col)}{max_row}"
+
+    page_setup = None
+    if src_ws.page_setup:
+        page_setup = (
+            src_ws.page_setup.orientation,
+            src_ws.page_setup.paperSize,
+            src_ws.page_setup.fitToHeight,
+            src_ws.page_setup.fitToWidth,
+        )
+
+    images = []
+    for image in getattr(src_ws, '_images', []):
+        images.append((image._data(), image.anchor))
+
+    return TemplateDigest(
+        cells=cells,
+        merged_ranges=[str(r) for r in src_ws.merged_cells.ranges],
+        row_heights=row_heights,
+        column_dimensions=column_dimensions,
+        max_column=src_ws.max_column,
+        page_setup=page_setup,
+        page_margins=copy(src_ws.page_margins) if src_ws.page_margins else None,
+        print_options=(src_ws.print_options.horizontalCentered, src_ws.print_options.verticalCentered),
+        print_area=print_area,
+        images=images,
+    )
+
+
+# 태그 안 속성값 (없으면 None)
+def xml_attr(tag, name):
+    match = re.search(r'\b%s="([^"]*)"' % re.escape(name), tag)
+    return match.group(1) if match else None
+
+
+# 목록 태그 안의 항목 태그들 (<fonts>...</fonts> 안의 <font> 등)
+def xml_children(xml, parent, child):
+    match = re.search(r'<%s\b[^>]*>(.*?)</%s>' % (parent, parent), xml, re.S)
+    if not match:
+        return []
+    return re.findall(r'<%s\b[^>]*/>|<%s\b[^>]*>.*?</%s>' % (child, child, child), match.group(1), re.S)
+
+
+# 관계 파일 목록 [(Id, Type, 절대 경로 또는 외부 주소, TargetMode)]
+def read_rels(parts, part):
+    folder, name = posixpath.split(part)
+    rels_xml = parts.get(posixpath.join(folder, '_rels', name + '.rels'))
+    if rels_xml is None:
+        return []
+    rels = []
+    for tag in re.findall(r'<Relationship\b[^>]*>', rels_xml.decode('utf-8')):
+        target, mode = xml_attr(tag, 'Target'), xml_attr(tag, 'TargetMode')
+        if mode != 'External':
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+        rels.append((xml_attr(tag, 'Id'), xml_attr(tag, 'Type'), target, mode))
+    return rels
+
+
+def _read_package(path):
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+
+    content_types = parts['[Content_Types].xml'].decode('utf-8')
+    overrides = {
+        xml_attr(tag, 'PartName').lstrip('/'): xml_attr(tag, 'ContentType')
+        for tag in re.findall(r'<Override\b[^>]*>', content_types)
+    }
+    defaults = {
+        xml_attr(tag, 'Extension').lower(): xml_attr(tag, 'ContentType')
+        for tag in re.findall(r'<Default\b[^>]*>', content_types)
+    }
+
+    # 활성 시트 찾기 (digest와 같은 시트)
+    workbook_part = next(target for _, rel_type, target, _ in read_rels(parts, '')
+                         if rel_type.endswith('/officeDocument'))
+    workbook_xml = parts[workbook_part].decode('utf-8')
+    sheets = re.findall(r'<sheet\b[^>]*>', workbook_xml)
+    view = re.search(r'<workbookView\b[^>]*>', workbook_xml)
+    active = int(xml_attr(view.group(0), 'activeTab') or 0) if view else 0
+    sheet_tag = sheets[active]
+    sheet_name = _unescape(xml_attr(sheet_tag, 'name'))
+    workbook_rels = {rel_id: target for rel_id, _, target, _ in read_rels(parts, workbook_part)}
+    sheet_part = workbook_rels[xml_attr(sheet_tag, 'r:id')]
+
+    # 시트 전용 이름 정의 (인쇄 영역, 인쇄 제목)
+    defined_names = [
+        (xml_attr(attrs, 'name'), _unescape(ref))
+        for attrs, ref in re.findall(r'<definedName\b([^>]*)>(.*?)</definedName>', workbook_xml, re.S)
+        if xml_attr(attrs, 'localSheetId') == str(active)
+    ]
+
+    # 공유 문자열 목록
+    shared_strings = []
+    for rel_id, rel_type, target, _ in read_rels(parts, workbook_part):
+        if rel_type.endswith('/sharedStrings'):
+            sst = parts[target].decode('utf-8')
+            shared_strings = re.findall(r'<si>(.*?)</si>|<si/>', sst, re.S)
+
+    # 공유 문자열 셀을 셀 안 문자열로 (결과 파일의 공유 문자열 표와 섞이지 않도록)
+    # 발음 정보의 글꼴 번호는 결과 파일에서 의미가 없으므로 뺌
+    def inline(match):
+        attrs, index = match.group(1), int(match.group(2))
+        text = re.sub(r'<phoneticPr\b[^>]*/>', '', shared_strings[index])
+        attrs = attrs.replace(' t="s"', ' t="inlineStr"')
+        return f'<c{attrs}><is>{text}</is></c>'
+
+    sheet_xml = parts[sheet_part].decode('utf-8')
+    sheet_xml = re.sub(r'<c\b([^>]*\bt="s"[^>]*)>\s*<v>(\d+)</v>\s*</c>', inline, sheet_xml)
+    # 결과 파일에서는 첫 번째 시트가 선택되어 있어야 함
+    sheet_xml = re.sub(r' tabSelected="1"', '', sheet_xml)
+
+    styles_xml = ''
+    for rel_id, rel_type, target, _ in read_rels(parts, workbook_part):
+        if rel_type.endswith('/styles'):
+            styles_xml = parts[target].decode('utf-8')
+    styles = {parent: xml_children(styles_xml, parent, child) for parent, child in STYLE_LISTS}
+    styles['numFmts'] = [
+        (int(xml_attr(tag, 'numFmtId')), tag) for tag in xml_children(styles_xml, 'numFmts', 'numFmt')
+    ]
+
+    return TemplatePackage(
+        sheet_xml=sheet_xml,
+        sheet_part=sheet_part,
+        parts=parts,
+        overrides=overrides,
+        defaults=defaults,
+        styles=styles,
+        sheet_name=sheet_name,
+        defined_names=defined_names,
+    )
+
+
+def _unescape(text):
+    return (text.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+            .replace('&apos;', "'").replace('&amp;', '&'))
+
+
+# 좌석 번호 → 셀 색인 {좌석: (셀 주소, 좌석 칸에 적힌 번호)}
+# 배치표의 좌석 번호는 첫 좌석에만 숫자가 있고 나머지는 '앞 좌석 + 1' 수식으로 이어지므로,
+# 수식을 따라가 번호를 계산하고 같은 첫 셀에서 이어진 셀끼리 묶음
+# 가장 큰 묶음이 일반 좌석(1, 2, ...), 나머지 묶음은 의자(의자1, 의자2, ...)
+# 수식이 없는 숫자 셀(행 번호 등)은 다른 셀이 참조하지 않으면 좌석이 아님
+def _seat_index(path):
+    sheet_xml = load_template_package(path).sheet_xml
+    constants = {}
+    formulas = {}
+    shared = {}  # 공유 수식 번호 → (기준 셀, 수식)
+    shared_cells = []  # 공유 수식을 쓰는 셀 (기준 셀의 수식을 옮겨서 계산)
+    for match in re.finditer(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', sheet_xml, re.S):
+        ref = xml_attr(match.group(1), 'r')
+        body = match.group(2) or ''
+        formula = re.search(r'<f\b([^>]*?)(?:/>|>(.*?)</f>)', body, re.S)
+        if formula:
+            attrs, text = formula.group(1), (formula.group(2) or '').strip()
+            if xml_attr(attrs, 't') == 'shared':
+                if text:
+                    shared[xml_attr(attrs, 'si')] = (ref, text)
+                shared_cells.append((ref, xml_attr(attrs, 'si')))
+            elif text:
+                _add_seat_formula(formulas, ref, text, ref)
+            continue
+        value = re.search(r'<v>(.*?)</v>', body, re.S)
+        if value and xml_attr(match.group(1), 't') in (None, 'n'):
+            number = float(value.group(1))
+            if number.is_integer():
+                constants[ref] = int(number)
+
+    for ref, si in shared_cells:
+        if si in shared:
+            base, text = shared[si]
+            _add_seat_formula(formulas, ref, text, base)
+
+    # 수식 셀마다 참조를 따라 첫 셀까지 가서 (첫 셀, 번호) 계산 (이미 계산한 셀에서 멈춤)
+    values = {}
+    for ref in formulas:
+        path = []
+        seen = set()
+        current = ref
+        while current in formulas and current not in values and current not in seen:
+            seen.add(current)
+            path.append(current)
+            current = formulas[current][0]
+        if current in values:
+            root, number = values[current]
+        elif current in constants:
+            root, number = current, constants[current]
+            values[current] = (root, number)
+        else:
+            continue  # 순환 참조이거나 숫자가 아닌 셀을 참조
+        for step in reversed(path):
+            number += formulas[step][1]
+            values[step] = (root, number)
+
+    chains = {}
+    for ref, (root, number) in values.items():
+        chains.setdefault(root, []).append((ref, number))
+    ordered = sorted(chains.values(), key=len, reverse=True)
+
+    index = {}
+    for i, chain in enumerate(ordered):
+        for ref, number in chain:
+            index.setdefault(number if i == 0 else chair_label(number), (ref, number))
+    return index
+
+
+# base 셀의 수식 text를 ref 셀로 옮겨 (참조 셀, 더할 수) 등록 (좌석 번호 수식이 아니면 무시)
+# 공유 수식은 기준 셀에서 떨어진 만큼 상대 참조를 옮김 ($가 붙은 행/열은 그대로)
+def _add_seat_formula(formulas, ref, text, base):
+    parsed = SEAT_FORMULA.match(text)
+    if not parsed:
+        return
+    col_abs, col, row_abs, row, sign, offset = parsed.groups()
+    col, row = column_index_from_string(col), int(row)
+    if ref != base:
+        ref_col, ref_row = coordinate_from_string(ref)
+        base_col, base_row = coordinate_from_string(base)
+        if not col_abs:
+            col += column_index_from_string(ref_col) - column_index_from_string(base_col)
+        if not row_abs:
+            row += ref_row - base_row
+    formulas[ref] = (f"{get_column_letter(col)}{row}", int(offset or 0) * (-1 if sign == '-' else 1))
+
+
+def _load(path, reader):
+    mtime = os.stat(path).st_mtime_ns
+    key = (path, reader.__name__)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        value = reader(path)
+        _cache[key] = (mtime, value)
+        return value
+
+
+# 템플릿을 읽어 캐시에 보관 (같은 파일이면 다시 파싱하지 않음)
+def load_template(path):
+    return _load(path, _digest)
+
+
+# 템플릿 패키지를 읽어 캐시에 보관 (시트를 통째로 옮겨 심을 때 사용)
+def load_template_package(path):
+    return _load(path, _read_package)
+
+
+# 좌석 → 셀 색인을 만들어 캐시에 보관 (템플릿 파일이 바뀔 때만 다시 만듦)
+def load_seat_index(path):
+    return _load(path, _seat_index)
+
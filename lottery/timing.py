@@ -0,0 +1,53 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# 제비뽑기 단계별 소요 시간
+# run_draw와 create_result_excel에 같은 StageTimer를 넘기면 단계마다 걸린 시간을 모아 둠
+# (앱의 '성능' 패널, 명령줄의 --timings JSON Lines 기록)
+
+# 단계 (기록 순서)
+STAGES = ('roster', 'history', 'assign', 'record', 'result_sheet', 'by_number_sheet', 'seating_chart', 'save')
+
+STAGE_LABELS = {
+    'roster': "명단 읽기",
+    'history': "기록 조회",
+    'assign': "좌석 배정",
+    'record': "기록 저장",
+    'result_sheet': "'제비뽑기 결과' 시트 작성",
+    'by_number_sheet': "'당첨번호순 결과' 시트 작성",
+    'seating_chart': "좌석 배치표 복사",
+    'save': "파일 저장",
+}
+
+
+# 단계별 소요 시간 (초), 같은 단계를 여러 번 재면 더함
+# 단계는 겹치지 않게 재야 합계가 전체 시간과 맞음
+class StageTimer:
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def total(self):
+        return sum(self.seconds.values())
+
+    # 잰 단계의 [(이름, 초)] (STAGES 순서, 모르는 단계는 뒤에)
+    def items(self):
+        order = {name: i for i, name in enumerate(STAGES)}
+        return sorted(self.seconds.items(), key=lambda item: order.get(item[0], len(STAGES)))
+
+    # 한 번의 제비뽑기 기록 (JSON 한 줄), fields는 함께 남길 값 (규칙 이름, 인원 등)
+    def json_line(self, **fields):
+        record = {'time': datetime.now().isoformat(timespec='seconds')}
+        record.update(fields)
+        record['stages_ms'] = {name: round(seconds * 1000, 3) for name, seconds in self.items()}
+        record['total_ms'] = round(self.total() * 1000, 3)
+        return json.dumps(record, ensure_ascii=False)
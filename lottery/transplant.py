@@ -0,0 +1,357 @@
+import io
+import posixpath
+import re
+import zipfile
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.exceptions import CellCoordinatesException
+
+from .template import read_rels, xml_attr
+
+# 좌석 배치표 시트를 셀 단위로 복사하지 않고, 템플릿의 시트 XML과 스타일, 그림 파일을
+# 결과 xlsx 패키지(zip) 안에 그대로 옮겨 심음
+# 스타일 번호와 파일 경로만 결과 파일에 맞게 바꾸므로 서식이 원본과 같게 유지됨
+
+# 결과 파일에 함께 옮기지 않는 관계 (통합 문서 단위로 번호가 매겨지는 부분)
+SKIPPED_REL_TYPES = ('/table', '/pivotTable', '/queryTable')
+
+# 엑셀 내장 숫자 서식 번호의 끝 (사용자 서식은 164부터)
+FIRST_CUSTOM_NUM_FMT = 164
+
+# 옮겨 심을 수 없는 템플릿이나 결과 파일에서 나는 오류
+# (읽을 수 없는 파일, 깨진 압축 파일, 빠진 파트나 관계, 해석할 수 없는 XML 값이나 셀 주소)
+TRANSPLANT_ERRORS = (
+    OSError, zipfile.BadZipFile, KeyError, StopIteration, IndexError, ValueError, CellCoordinatesException
+)
+
+
+# 결과 파일에 없는 경로 만들기 (sheet1.xml이 있으면 sheet2.xml, sheet3.xml, ...)
+def _unique_part(part, taken):
+    if part not in taken:
+        return part
+    stem, number, ext = re.match(r'(.*?)(\d*)(\.[^./]*)?$', part).groups()
+    n = int(number or 1)
+    while True:
+        n += 1
+        candidate = f"{stem}{n}{ext or ''}"
+        if candidate not in taken:
+            return candidate
+
+
+def _rels_part(part):
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def _rels_xml(rels):
+    items = []
+    for rel_id, rel_type, target, mode in rels:
+        mode_attr = f' TargetMode="{mode}"' if mode else ''
+        items.append(f'<Relationship Id="{rel_id}" Type="{rel_type}" Target="{target}"{mode_attr}/>')
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(items) + '</Relationships>').encode('utf-8')
+
+
+# 목록 태그에 항목을 덧붙이고 count를 갱신 (목록이 없으면 before 태그 앞에 새로 만듦)
+def _append_list(xml, parent, items, before):
+    if not items:
+        return xml
+    match = re.search(r'<%s\b[^>]*/>|<%s\b[^>]*>(.*?)</%s>' % (parent, parent, parent), xml, re.S)
+    if match is None:
+        pos = len(xml) - len('</styleSheet>')
+        for tag in before:
+            found = re.search(r'<%s\b' % tag, xml)
+            if found:
+                pos = found.start()
+                break
+        return xml[:pos] + f'<{parent} count="{len(items)}">' + ''.join(items) + f'</{parent}>' + xml[pos:]
+
+    inner = match.group(1) or ''
+    child = re.match(r'<(\w+)', items[0]).group(1)
+    count = len(re.findall(r'<%s\b' % child, inner)) + len(items)
+    return xml[:match.start()] + f'<{parent} count="{count}">' + inner + ''.join(items) + f'</{parent}>' + xml[match.end():]
+
+
+def _count(xml, parent, child):
+    match = re.search(r'<%s\b[^>]*>(.*?)</%s>' % (parent, parent), xml, re.S)
+    return len(re.findall(r'<%s\b' % child, match.group(1))) if match else 0
+
+
+def _set_attr(tag, name, value):
+    if re.search(r'\b%s="[^"]*"' % name, tag):
+        return re.sub(r'\b%s="[^"]*"' % name, f'{name}="{value}"', tag)
+    return re.sub(r'\s*(/?>)$', f' {name}="{value}"\\1', tag, count=1)
+
+
+# 템플릿 스타일을 결과 스타일 시트 뒤에 붙이고, 템플릿 번호 → 결과 번호 변환 정보를 반환
+def _merge_styles(styles_xml, template_styles):
+    # 사용자 숫자 서식은 결과 파일의 번호와 겹치지 않게 새 번호를 줌
+    existing = [int(xml_attr(tag, 'numFmtId')) for tag in re.findall(r'<numFmt\b[^>]*>', styles_xml)]
+    next_id = max(existing + [FIRST_CUSTOM_NUM_FMT - 1]) + 1
+    num_fmt_map = {}
+    num_fmts = []
+    for fmt_id, tag in template_styles['numFmts']:
+        if fmt_id >= FIRST_CUSTOM_NUM_FMT:
+            num_fmt_map[fmt_id] = next_id
+            num_fmts.append(_set_attr(tag, 'numFmtId', next_id))
+            next_id += 1
+
+    offsets = {
+        'fontId': _count(styles_xml, 'fonts', 'font'),
+        'fillId': _count(styles_xml, 'fills', 'fill'),
+        'borderId': _count(styles_xml, 'borders', 'border'),
+    }
+    xf_offset = _count(styles_xml, 'cellXfs', 'xf')
+    dxf_offset = _count(styles_xml, 'dxfs', 'dxf')
+
+    def remap_num_fmt(match):
+        fmt_id = int(match.group(2))
+        return f'{match.group(1)}"{num_fmt_map.get(fmt_id, fmt_id)}"'
+
+    def remap_xf(xf):
+        head = re.match(r'<xf\b[^>]*>', xf).group(0)
+        new_head = re.sub(r'(\bnumFmtId=)"(\d+)"', remap_num_fmt, head)
+        for name, offset in offsets.items():
+            value = xml_attr(new_head, name)
+            if value is not None:
+                new_head = _set_attr(new_head, name, int(value) + offset)
+        # 템플릿의 셀 스타일(표준 등)은 옮기지 않으므로 결과 파일의 기본 스타일을 기준으로 함
+        new_head = _set_attr(new_head, 'xfId', 0)
+        return new_head + xf[len(head):]
+
+    dxfs = [re.sub(r'(<numFmt\b[^>]*\bnumFmtId=)"(\d+)"', remap_num_fmt, dxf) for dxf in template_styles['dxfs']]
+
+    styles_xml = _append_list(styles_xml, 'numFmts', num_fmts, ['fonts'])
+    styles_xml = _append_list(styles_xml, 'fonts', template_styles['fonts'], ['fills'])
+    styles_xml = _append_list(styles_xml, 'fills', template_styles['fills'], ['borders'])
+    styles_xml = _append_list(styles_xml, 'borders', template_styles['borders'], ['cellStyleXfs', 'cellXfs'])
+    styles_xml = _append_list(styles_xml, 'cellXfs', [remap_xf(xf) for xf in template_styles['cellXfs']],
+                              ['cellStyles', 'dxfs', 'tableStyles', 'colors', 'extLst'])
+    styles_xml = _append_list(styles_xml, 'dxfs', dxfs, ['tableStyles', 'colors', 'extLst'])
+    return styles_xml, xf_offset, dxf_offset
+
+
+# 열 설정을 열 번호별 속성으로 펼침 {열 번호: <col> 태그}
+def _expand_cols(sheet_xml):
+    cols = {}
+    for tag in re.findall(r'<col\b[^>]*>', sheet_xml):
+        for col_idx in range(int(xml_attr(tag, 'min')), int(xml_attr(tag, 'max')) + 1):
+            cols[col_idx] = tag
+    return cols
+
+
+# 열 너비 다시 쓰기: max_column까지는 column_width(열 문자, 원본 너비)로 너비를 정하고 나머지는 원본 그대로
+def _rewrite_cols(sheet_xml, max_column, column_width, xf_offset):
+    cols = _expand_cols(sheet_xml)
+    items = []
+    for col_idx in range(1, max_column + 1):
+        src = cols.get(col_idx, '')
+        src_width = xml_attr(src, 'width')
+        width = column_width(get_column_letter(col_idx), float(src_width) if src_width else None)
+        attrs = f'min="{col_idx}" max="{col_idx}"'
+        if width is not None:
+            attrs += f' width="{width}" customWidth="1"'
+        elif src_width:
+            attrs += f' width="{src_width}"'
+        style = xml_attr(src, 'style')
+        if style is not None:
+            attrs += f' style="{int(style) + xf_offset}"'
+        if xml_attr(src, 'hidden') in ('1', 'true'):
+            attrs += ' hidden="1"'
+        if src or width is not None:
+            items.append(f'<col {attrs}/>')
+
+    # max_column 뒤의 열 설정은 그대로 (스타일 번호만 변환)
+    seen = set()
+    for col_idx, tag in sorted(cols.items()):
+        if col_idx <= max_column or tag in seen:
+            continue
+        seen.add(tag)
+        tag = _set_attr(tag, 'min', max(int(xml_attr(tag, 'min')), max_column + 1))
+        style = xml_attr(tag, 'style')
+        if style is not None:
+            tag = _set_attr(tag, 'style', int(style) + xf_offset)
+        items.append(tag)
+
+    cols_xml = '<cols>' + ''.join(items) + '</cols>' if items else ''
+    if re.search(r'<cols\b', sheet_xml):
+        return re.sub(r'<cols\b[^>]*>.*?</cols>|<cols\b[^>]*/>', lambda m: cols_xml, sheet_xml, count=1, flags=re.S)
+    return re.sub(r'(<sheetData\b)', lambda m: cols_xml + m.group(1), sheet_xml, count=1)
+
+
+# 용지에 맞추기 설정 켜기 (<sheetPr>는 시트의 첫 번째 항목)
+def _fit_to_page(sheet_xml):
+    sheet_pr = re.search(r'<sheetPr\b[^>]*/>|<sheetPr\b[^>]*>.*?</sheetPr>', sheet_xml, re.S)
+    if sheet_pr is None:
+        root = re.search(r'<worksheet\b[^>]*>', sheet_xml)
+        return sheet_xml[:root.end()] + '<sheetPr><pageSetUpPr fitToPage="1"/></sheetPr>' + sheet_xml[root.end():]
+
+    block = sheet_pr.group(0)
+    setup = re.search(r'<pageSetUpPr\b[^>]*>', block)
+    if setup:
+        block = block.replace(setup.group(0), _set_attr(setup.group(0), 'fitToPage', 1))
+    elif block.endswith('/>'):
+        block = block[:-2] + '><pageSetUpPr fitToPage="1"/></sheetPr>'
+    else:
+        block = block.replace('</sheetPr>', '<pageSetUpPr fitToPage="1"/></sheetPr>')
+    return sheet_xml[:sheet_pr.start()] + block + sheet_xml[sheet_pr.end():]
+
+
+def _max_cell(sheet_xml):
+    refs = re.findall(r'<c\b[^>]*\br="([A-Z]+)(\d+)"', sheet_xml)
+    if not refs:
+        return 1, 1
+    return (max(column_index_from_string(col) for col, _ in refs), max(int(row) for _, row in refs))
+
+
+def _quote_sheet(name):
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+# 셀 내용을 값으로 바꿈 (cell_values: {셀 주소: 숫자 또는 문자열}, 수식과 스타일 외 속성은 뺌)
+# 시트 XML을 한 번 훑으며 주소로 찾으므로 O(셀 수)
+def _replace_cells(sheet_xml, cell_values):
+    def replace(match):
+        attrs = match.group(1)
+        value = cell_values.get(xml_attr(attrs, 'r'))
+        if value is None:
+            return match.group(0)
+        attrs = re.sub(r'\s+(?:t|cm|vm|ph)="[^"]*"', '', attrs)
+        if isinstance(value, str):
+            return f'<c{attrs} t="inlineStr"><is><t>{_escape(value)}</t></is></c>'
+        return f'<c{attrs}><v>{value}</v></c>'
+
+    return re.sub(r'<c\b([^>]*?)(?:/>|>.*?</c>)', replace, sheet_xml, flags=re.S)
+
+
+# 결과 xlsx(바이트)에 템플릿 시트를 title 이름의 마지막 시트로 옮겨 심은 xlsx(바이트)를 반환
+# column_width(열 문자, 원본 너비)는 새 열 너비(없으면 None)를 돌려주는 함수
+# cell_values: 옮겨 심으면서 바꿀 셀 값 {셀 주소: 값} (좌석 배치표에 이름 채우기 등)
+def transplant_sheet(xlsx, package, title, column_width=None, cell_values=None):
+    with zipfile.ZipFile(io.BytesIO(xlsx)) as zf:
+        out = {info.filename: zf.read(info.filename) for info in zf.infolist()}
+
+    content_types = out['[Content_Types].xml'].decode('utf-8')
+    workbook_part = next(target for _, rel_type, target, _ in read_rels(out, '')
+                         if rel_type.endswith('/officeDocument'))
+    workbook_rels = read_rels(out, workbook_part)
+    styles_part = next(target for _, rel_type, target, _ in workbook_rels if rel_type.endswith('/styles'))
+
+    # 1. 스타일 합치기
+    styles_xml, xf_offset, dxf_offset = _merge_styles(out[styles_part].decode('utf-8'), package.styles)
+    out[styles_part] = styles_xml.encode('utf-8')
+
+    # 2. 시트 XML의 스타일 번호 변환
+    sheet_xml = package.sheet_xml
+    if cell_values:
+        sheet_xml = _replace_cells(sheet_xml, cell_values)
+    sheet_xml = re.sub(r'(<(?:c|row)\b[^>]*?\bs=)"(\d+)"', lambda m: f'{m.group(1)}"{int(m.group(2)) + xf_offset}"', sheet_xml)
+    sheet_xml = re.sub(r'(\bdxfId=)"(\d+)"', lambda m: f'{m.group(1)}"{int(m.group(2)) + dxf_offset}"', sheet_xml)
+    max_column, max_row = _max_cell(sheet_xml)
+    if column_width is not None:
+        sheet_xml = _rewrite_cols(sheet_xml, max_column, column_width, xf_offset)
+    else:
+        sheet_xml = re.sub(r'(<col\b[^>]*?\bstyle=)"(\d+)"', lambda m: f'{m.group(1)}"{int(m.group(2)) + xf_offset}"', sheet_xml)
+    sheet_xml = _fit_to_page(sheet_xml)
+
+    # 3. 시트와 연결된 파일(그림, 인쇄 설정 등) 복사
+    taken = set(out)
+    new_types = {}
+
+    def copy_part(src_part, copied):
+        if src_part in copied:
+            return copied[src_part]
+        dst_part = _unique_part(src_part, taken)
+        taken.add(dst_part)
+        copied[src_part] = dst_part
+        if src_part in package.overrides:
+            new_types[('Override', dst_part)] = package.overrides[src_part]
+        else:
+            ext = posixpath.splitext(src_part)[1][1:].lower()
+            new_types[('Default', ext)] = package.defaults.get(ext, 'application/octet-stream')
+
+        rels = []
+        for rel_id, rel_type, target, mode in read_rels(package.parts, src_part):
+            if mode == 'External':
+                rels.append((rel_id, rel_type, target, mode))
+            elif not rel_type.endswith(SKIPPED_REL_TYPES) and target in package.parts:
+                dst_target = copy_part(target, copied)
+                rels.append((rel_id, rel_type, posixpath.relpath(dst_target, posixpath.dirname(dst_part)), None))
+        if src_part != package.sheet_part:
+            out[dst_part] = package.parts[src_part]
+        if rels:
+            out[_rels_part(dst_part)] = _rels_xml(rels)
+            taken.add(_rels_part(dst_part))
+        return dst_part
+
+    sheet_part = copy_part(package.sheet_part, {})
+    # 옮기지 않은 표는 시트에서도 뺌
+    sheet_xml = re.sub(r'<tableParts\b[^>]*/>|<tableParts\b[^>]*>.*?</tableParts>', '', sheet_xml, flags=re.S)
+    out[sheet_part] = sheet_xml.encode('utf-8')
+
+    for (kind, key), content_type in new_types.items():
+        if kind == 'Override':
+            content_types = content_types.replace(
+                '</Types>', f'<Override PartName="/{key}" ContentType="{content_type}"/></Types>')
+        elif not re.search(r'<Default\b[^>]*\bExtension="%s"' % re.escape(key), content_types, re.I):
+            content_types = content_types.replace(
+                '</Types>', f'<Default Extension="{key}" ContentType="{content_type}"/></Types>')
+    out['[Content_Types].xml'] = content_types.encode('utf-8')
+
+    # 4. 통합 문서에 시트 등록
+    rel_ids = {rel_id for rel_id, _, _, _ in workbook_rels}
+    n = len(rel_ids) + 1
+    while f"rId{n}" in rel_ids:
+        n += 1
+    sheet_rel_id = f"rId{n}"
+    workbook_rels.append((
+        sheet_rel_id, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet', sheet_part, None,
+    ))
+    out[_rels_part(workbook_part)] = _rels_xml([
+        (rel_id, rel_type, target if mode == 'External' else '/' + target, mode)
+        for rel_id, rel_type, target, mode in workbook_rels
+    ])
+
+    workbook_xml = out[workbook_part].decode('utf-8')
+    sheets = re.findall(r'<sheet\b[^>]*>', workbook_xml)
+    sheet_id = max(int(xml_attr(tag, 'sheetId')) for tag in sheets) + 1
+    workbook_xml = workbook_xml.replace(
+        sheets[-1], sheets[-1] + f'<sheet name="{_escape(title)}" sheetId="{sheet_id}" state="visible" r:id="{sheet_rel_id}"/>', 1)
+
+    # 인쇄 영역 등 시트 전용 이름은 새 시트 이름으로 바꿔서 등록 (없으면 전체 데이터 영역)
+    defined_names = package.defined_names
+    if not any(name == '_xlnm.Print_Area' for name, _ in defined_names):
+        defined_names = defined_names + [('_xlnm.Print_Area', f"$A$1:${get_column_letter(max_column)}${max_row}")]
+    src_sheet = re.escape(package.sheet_name)
+    src_ref = r"(?:'%s'|%s)!" % (src_sheet.replace("'", "''"), src_sheet)
+    local_id = len(sheets)
+    names_xml = ''
+    for name, ref in defined_names:
+        ref = re.sub(src_ref, lambda m: _quote_sheet(title) + '!', ref)
+        if '!' not in ref:
+            ref = f"{_quote_sheet(title)}!{ref}"
+        names_xml += f'<definedName name="{name}" localSheetId="{local_id}">{_escape(ref)}</definedName>'
+    workbook_xml = re.sub(r'<definedNames\s*/>', '', workbook_xml)
+    if '</definedNames>' in workbook_xml:
+        workbook_xml = workbook_xml.replace('</definedNames>', names_xml + '</definedNames>', 1)
+    else:
+        workbook_xml = workbook_xml.replace('</sheets>', '</sheets><definedNames>' + names_xml + '</definedNames>', 1)
+    out[workbook_part] = workbook_xml.encode('utf-8')
+
+    # 문서 속성의 시트 이름 목록은 선택 항목이라 새 시트와 어긋나지 않도록 뺌
+    for _, rel_type, target, _ in read_rels(out, ''):
+        if rel_type.endswith('/extended-properties') and target in out:
+            app_xml = out[target].decode('utf-8')
+            app_xml = re.sub(r'<(HeadingPairs|TitlesOfParts)>.*?</\1>', '', app_xml, flags=re.S)
+            out[target] = app_xml.encode('utf-8')
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for part, data in out.items():
+            zf.writestr(part, data)
+    return output.getvalue()
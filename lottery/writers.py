@@ -0,0 +1,250 @@
+import io
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.packaging.custom import StringProperty
+from openpyxl.utils import column_index_from_string
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.page import PageMargins
+
+from .layout import (
+    BY_NUMBER_COLUMN_WIDTHS,
+    RESULT_COLUMN_WIDTHS,
+    by_number_rows,
+    result_rows,
+)
+from .styles import RESULT_STYLES, add_result_styles, border_styles, sides_border
+from .timing import StageTimer
+
+# 결과 시트 작성기
+# 작성기는 (records, today)를 받아 "제비뽑기 결과", "당첨번호순 결과" 두 시트가 든 xlsx 바이트를 반환
+# records: 이름순으로 정렬된 {'이름', '당첨번호', ...} 목록, today: 결과에 표시할 날짜 문자열
+# properties: 문서 속성(사용자 지정)에 남길 {이름: 문자열} (난수 씨앗 등), 없으면 남기지 않음
+# timer: 시트별 작성('result_sheet', 'by_number_sheet')과 저장('save') 시간을 모을 timing.StageTimer
+
+
+def _save(wb, properties, timer):
+    for name, value in (properties or {}).items():
+        wb.custom_doc_props.append(StringProperty(name=name, value=value))
+    with timer.stage('save'):
+        output = io.BytesIO()
+        wb.save(output)
+        return output.getvalue()
+
+
+# openpyxl 일반 워크북
+# 배치 계산(layout)이 정한 값, 스타일, 최종 테두리로 셀마다 한 번씩만 씀
+def write_openpyxl(records, today, properties=None, timer=None):
+    if timer is None:
+        timer = StageTimer()
+    with timer.stage('result_sheet'):
+        # 새 워크북 생성
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "제비뽑기 결과"
+        
+        # 페이지 설정
+        _setup_result_page(ws)
+        
+        # 공용 스타일 등록 (셀에는 이름으로 지정)
+        add_result_styles(wb)
+        
+        _write_layout_rows(ws, result_rows(records, today))
+        for col_letter, width in RESULT_COLUMN_WIDTHS.items():
+            ws.column_dimensions[col_letter].width = width
+    
+    # 당첨번호 순 결과 시트 추가
+    with timer.stage('by_number_sheet'):
+        ws_by_number = wb.create_sheet(title="당첨번호순 결과")
+        _write_layout_rows(ws_by_number, by_number_rows(records))
+        for col_letter, width in BY_NUMBER_COLUMN_WIDTHS.items():
+            ws_by_number.column_dimensions[col_letter].width = width
+    
+    return _save(wb, properties, timer)
+
+
+def _write_layout_rows(ws, rows):
+    for layout_row in rows:
+        for start_col, end_col in layout_row.merges:
+            ws.merge_cells(start_row=layout_row.row, start_column=start_col,
+                           end_row=layout_row.row, end_column=end_col)
+        for layout_cell in layout_row.cells:
+            cell = ws.cell(row=layout_row.row, column=layout_cell.column, value=layout_cell.value)
+            if layout_cell.style:
+                cell.style = layout_cell.style
+            if layout_cell.border:
+                cell.border = sides_border(*layout_cell.border)
+        if layout_row.height:
+            ws.row_dimensions[layout_row.row].height = layout_row.height
+
+
+# "제비뽑기 결과" 시트 페이지 설정
+def _setup_result_page(ws):
+    ws.page_setup.paperSize = 9  # A4 용지
+    ws.page_setup.orientation = 'portrait'
+    ws.page_setup.horizontalCentered = True
+    ws.print_options.horizontalCentered = True
+    
+    # 여백 설정
+    ws.page_margins = PageMargins(bottom=0.4)
+    
+    # 맞춤 설정
+    ws.page_setup.fitToPage = True
+    ws.page_setup.fitToWidth = 1
+    ws.page_setup.fitToHeight = 0
+
+
+# 쓰기 전용 워크북에 결과 시트 두 개를 행 순서대로 씀
+# (열 너비와 페이지 설정은 첫 행을 쓰기 전에, 행 높이는 그 행을 쓰기 전에 정해야 함)
+def write_openpyxl_write_only(records, today, properties=None, timer=None):
+    if timer is None:
+        timer = StageTimer()
+    with timer.stage('result_sheet'):
+        wb = Workbook(write_only=True)
+        add_result_styles(wb)
+        
+        ws = wb.create_sheet("제비뽑기 결과")
+        _setup_result_page(ws)
+        for col_letter, width in RESULT_COLUMN_WIDTHS.items():
+            ws.column_dimensions[col_letter].width = width
+        _append_layout_rows(ws, result_rows(records, today))
+    
+    with timer.stage('by_number_sheet'):
+        ws_by_number = wb.create_sheet("당첨번호순 결과")
+        for col_letter, width in BY_NUMBER_COLUMN_WIDTHS.items():
+            ws_by_number.column_dimensions[col_letter].width = width
+        _append_layout_rows(ws_by_number, by_number_rows(records))
+    
+    return _save(wb, properties, timer)
+
+
+def _append_layout_rows(ws, rows):
+    for layout_row in rows:
+        if layout_row.height:
+            ws.row_dimensions[layout_row.row].height = layout_row.height
+        for start_col, end_col in layout_row.merges:
+            ws.merged_cells.add(CellRange(min_col=start_col, min_row=layout_row.row,
+                                          max_col=end_col, max_row=layout_row.row))
+        
+        values = [None] * (layout_row.cells[-1].column if layout_row.cells else 0)
+        for layout_cell in layout_row.cells:
+            cell = WriteOnlyCell(ws, value=layout_cell.value)
+            if layout_cell.style:
+                cell.style = layout_cell.style
+            if layout_cell.border:
+                cell.border = sides_border(*layout_cell.border)
+            values[layout_cell.column - 1] = cell
+        ws.append(values)
+        # 이미 쓴 행의 높이 정보는 더 필요 없음
+        ws.row_dimensions.pop(layout_row.row, None)
+
+
+# XlsxWriter 선 종류 번호
+_XLSXWRITER_BORDERS = {None: 0, 'thin': 1, 'medium': 2}
+
+
+# 이름 있는 스타일과 테두리를 XlsxWriter 서식 속성으로 변환
+def _xlsxwriter_props(style, border):
+    props = {}
+    font, style_border, fill, alignment = RESULT_STYLES[style] if style else (None, None, None, None)
+    if font:
+        if font.b:
+            props['bold'] = True
+        if font.sz:
+            props['font_size'] = font.sz
+    if fill:
+        props['pattern'] = 1
+        props['bg_color'] = '#' + fill.fgColor.rgb[-6:]
+    if alignment:
+        props['align'] = alignment.horizontal
+        props['valign'] = 'vcenter' if alignment.vertical == 'center' else alignment.vertical
+    sides = border or (border_styles(style_border) if style_border else (None, None, None, None))
+    for name, side in zip(('left', 'right', 'top', 'bottom'), sides):
+        if side:
+            props[name] = _XLSXWRITER_BORDERS[side]
+    return props
+
+
+# openpyxl 열 너비(글자 수)를 픽셀로 (기본 글꼴 Calibri 11의 글자 폭 7픽셀)
+def _width_pixels(width):
+    return round(width * 7)
+
+
+def _xlsxwriter_rows(workbook, ws, rows, formats):
+    for layout_row in rows:
+        row = layout_row.row - 1
+        if layout_row.height:
+            ws.set_row(row, layout_row.height)
+        # 값 없이 병합 범위만 등록 (셀 서식은 아래에서 셀마다 씀)
+        for start_col, end_col in layout_row.merges:
+            ws.merge_range(row, start_col - 1, row, end_col - 1, None)
+        for cell in layout_row.cells:
+            key = (cell.style, cell.border)
+            if key not in formats:
+                formats[key] = workbook.add_format(_xlsxwriter_props(cell.style, cell.border))
+            cell_format = formats[key]
+            col = cell.column - 1
+            if cell.value is None:
+                ws.write_blank(row, col, None, cell_format)
+            elif isinstance(cell.value, (int, float)) and not isinstance(cell.value, bool):
+                ws.write_number(row, col, cell.value, cell_format)
+            else:
+                ws.write_string(row, col, str(cell.value), cell_format)
+
+
+# 여백 (XlsxWriter 기본 여백은 openpyxl과 달라서 openpyxl 값으로 맞춤)
+def _xlsxwriter_margins(ws, margins):
+    ws.set_margins(left=margins.left, right=margins.right, top=margins.top, bottom=margins.bottom)
+    ws.set_header('', {'margin': margins.header})
+    ws.set_footer('', {'margin': margins.footer})
+
+
+# XlsxWriter constant_memory 모드 (행을 다 쓰면 바로 임시 파일로 내보냄)
+def write_xlsxwriter(records, today, properties=None, timer=None):
+    import xlsxwriter
+
+    if timer is None:
+        timer = StageTimer()
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'strings_to_numbers': False,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    })
+    formats = {}
+
+    with timer.stage('result_sheet'):
+        ws = workbook.add_worksheet("제비뽑기 결과")
+        # openpyxl 작성기와 같은 페이지 설정 (A4, 가로 1페이지에 맞춤, 여백)
+        ws.set_paper(9)
+        ws.set_portrait()
+        ws.center_horizontally()
+        _xlsxwriter_margins(ws, PageMargins(bottom=0.4))
+        ws.fit_to_pages(1, 0)
+        for col_letter, width in RESULT_COLUMN_WIDTHS.items():
+            col = column_index_from_string(col_letter) - 1
+            ws.set_column_pixels(col, col, _width_pixels(width))
+        _xlsxwriter_rows(workbook, ws, result_rows(records, today), formats)
+
+    with timer.stage('by_number_sheet'):
+        ws_by_number = workbook.add_worksheet("당첨번호순 결과")
+        _xlsxwriter_margins(ws_by_number, PageMargins())
+        for col_letter, width in BY_NUMBER_COLUMN_WIDTHS.items():
+            col = column_index_from_string(col_letter) - 1
+            ws_by_number.set_column_pixels(col, col, _width_pixels(width))
+        _xlsxwriter_rows(workbook, ws_by_number, by_number_rows(records), formats)
+
+    for name, value in (properties or {}).items():
+        workbook.set_custom_property(name, value, 'text')
+    with timer.stage('save'):
+        workbook.close()
+    return output.getvalue()
+
+
+# 작성기 이름 → 함수
+RESULT_WRITERS = {
+    'openpyxl': write_openpyxl,
+    'openpyxl-write-only': write_openpyxl_write_only,
+    'xlsxwriter': write_xlsxwriter,
+}
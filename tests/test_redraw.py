@@ -0,0 +1,65 @@
+# 다시 뽑기(redraw_seats)가 이전 좌석을 지금 규칙으로 검사하고, 동명이인은 추측하지 않는지 확인
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.draw import redraw_seats  # noqa: E402
+from lottery.rng import parse_seed  # noqa: E402
+
+CONFIG = {
+    'seat_count': 30,
+    'chair_count': 5,
+    'special_seat_ranges': {'특정': (1, 5)},
+    'prev_front_min_seat': 20,
+}
+SEED = parse_seed('sha256:' + '0' * 64)
+
+
+def person(name, group='1남'):
+    return {'이름': name, '그룹': group}
+
+
+def redraw(persons, previous, prev_front_names=()):
+    diagnostics = []
+    results = redraw_seats(persons, previous, CONFIG, prev_front_names, diagnostics, seed=SEED)
+    seats = {record['이름']: record['당첨번호'] for record in results['records']}
+    warnings = [d.message for d in diagnostics if d.level == 'warning']
+    return results, seats, warnings
+
+
+def test_keeps_seats_that_fit_the_rules():
+    results, seats, warnings = redraw([person('가'), person('특정')], [(7, '가'), (3, '특정')])
+    assert seats == {'가': 7, '특정': 3}
+    assert results['added'] == [] and warnings == []
+
+
+def test_redraws_special_name_outside_its_range():
+    results, seats, warnings = redraw([person('특정')], [(12, '특정')])
+    assert 1 <= seats['특정'] <= 5
+    assert results['added'] == ['특정']
+    assert len(warnings) == 1
+
+
+def test_redraws_prev_front_name_in_front_seat():
+    results, seats, warnings = redraw([person('가'), person('나')], [(3, '가'), (25, '나')], prev_front_names={'가', '나'})
+    assert seats['나'] == 25
+    assert seats['가'] >= 20
+    assert results['added'] == ['가']
+    assert len(warnings) == 1
+
+
+def test_duplicate_names_are_not_guessed():
+    persons = [person('가', '1남'), person('가', '2남'), person('나')]
+    results, seats, warnings = redraw(persons, [(7, '가'), (8, '나')])
+    assert seats['나'] == 8
+    assert results['added'] == ['가', '가']
+    assert results['removed'] == []
+    assert len(warnings) == 1 and '가' in warnings[0]
+
+
+def test_extra_previous_seats_for_duplicate_name_are_removed():
+    results, seats, warnings = redraw([person('가')], [(7, '가'), (9, '가')])
+    assert results['added'] == ['가']
+    assert results['removed'] == ['가']
+    assert len(warnings) == 1
@@ -0,0 +1,72 @@
+# 결과 시트 테두리 회귀 테스트
+# 작성기마다 두 결과 시트의 셀별 (left, right, top, bottom) 테두리를
+# 기준 커밋(0cacea4)의 lottery_app.create_result_excel이 만든 테두리(data/result_borders.json)와 비교
+# 실행: python -m pytest tests
+import io
+import json
+import os
+import random
+import sys
+
+import pytest
+from openpyxl import load_workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.writers import RESULT_WRITERS  # noqa: E402
+
+# {인원 수: {시트: {셀 주소: [left, right, top, bottom]}}} (테두리 없는 셀은 뺌)
+BORDERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "result_borders.json")
+
+SHEETS = ["제비뽑기 결과", "당첨번호순 결과"]
+
+SEAT_COUNT = 225
+
+TODAY = "2025년 04월 09일"
+
+
+# 기준 테두리를 만들 때와 같은 결과 (일반 좌석 225개, 나머지는 의자, 이름순)
+def make_records(n_persons, seed=0):
+    rng = random.Random(seed)
+    names = [f"사람{i:06d}" for i in range(n_persons)]
+    seats = list(range(1, min(n_persons, SEAT_COUNT) + 1))
+    seats += [f"의자{i}" for i in range(1, n_persons - len(seats) + 1)]
+    rng.shuffle(seats)
+    records = [{'이름': name, '당첨번호': seat} for name, seat in zip(names, seats)]
+    return sorted(records, key=lambda record: record['이름'])
+
+
+# xlsx 바이트의 시트별 테두리 (기준 파일과 같은 형태)
+def border_map(data):
+    wb = load_workbook(io.BytesIO(data))
+    borders = {}
+    for title in SHEETS:
+        cells = {}
+        for row in wb[title].iter_rows():
+            for cell in row:
+                sides = [side.style if side else None
+                         for side in (cell.border.left, cell.border.right, cell.border.top, cell.border.bottom)]
+                if any(sides):
+                    cells[cell.coordinate] = sides
+        borders[title] = cells
+    return borders
+
+
+with open(BORDERS_PATH, encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.mark.parametrize('backend', list(RESULT_WRITERS))
+@pytest.mark.parametrize('n_persons', [int(n) for n in EXPECTED])
+def test_border_map_matches_baseline(n_persons, backend):
+    if backend == 'xlsxwriter':
+        pytest.importorskip('xlsxwriter')
+    actual = border_map(RESULT_WRITERS[backend](make_records(n_persons), TODAY))
+    expected = EXPECTED[str(n_persons)]
+    for title in SHEETS:
+        differences = {
+            ref: (expected[title].get(ref), actual[title].get(ref))
+            for ref in set(expected[title]) | set(actual[title])
+            if expected[title].get(ref) != actual[title].get(ref)
+        }
+        assert not differences, f"{title}: {dict(sorted(differences.items())[:10])}"
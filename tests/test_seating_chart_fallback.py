@@ -0,0 +1,40 @@
+# 좌석 배치표를 옮겨 심거나 복사할 수 없을 때 결과 파일은 그대로 두고 경고만 남기는지 확인
+import io
+import logging
+import os
+import sys
+
+import openpyxl
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lottery.export import _add_seating_chart  # noqa: E402
+
+
+def empty_workbook():
+    output = io.BytesIO()
+    openpyxl.Workbook().save(output)
+    return output.getvalue()
+
+
+def test_broken_template_falls_back_and_warns(tmp_path, caplog):
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a zip file")
+
+    with caplog.at_level(logging.WARNING, logger='lottery.export'):
+        data = _add_seating_chart(empty_workbook(), True, path=str(path), title="좌석 배치표")
+
+    assert openpyxl.load_workbook(io.BytesIO(data)).sheetnames == ["Sheet"]
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert "셀 단위 복사로 전환" in messages[0] and "BadZipFile" in messages[0]
+
+
+def test_template_bugs_are_not_swallowed(monkeypatch):
+    def broken(*args):
+        raise TypeError("bug")
+
+    monkeypatch.setattr('lottery.export.transplant_sheet', broken)
+    with pytest.raises(TypeError):
+        _add_seating_chart(empty_workbook(), True)